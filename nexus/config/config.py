@@ -1,153 +1,411 @@
 """Central configuration module for the Nexus YouTube automation pipeline.
 
-Loads environment variables and initializes API clients for:
+Loads environment variables and provides lazily-initialised API clients for:
 - AWS Bedrock (LLM inference)
+- YouTube Data API v3 (research)
 - ElevenLabs (text-to-speech)
 - Supabase (database / logging)
+
+Each client is built on first use via its ``get_*_client()`` accessor, so
+importing this module for ``settings`` alone does not pay SDK start-up
+costs.  Set ``NEXUS_EAGER_CLIENTS=1`` to build every client at import time.
 """
 
 import os
 import sys
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import Any, Callable
+
+# Load environment variables from .env file.  Child processes inherit the
+# already-populated environment, so the sentinel lets them skip re-parsing.
+if os.getenv("NEXUS_ENV_LOADED") != "1":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    os.environ["NEXUS_ENV_LOADED"] = "1"
+
+# ---------------------------------------------------------------------------
+# Settings -- all env vars in one place, read once
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable snapshot of the pipeline's environment variables.
+
+    Each field is read from the upper-cased environment variable of the
+    same name, falling back to the default below.
+    """
+
+    aws_access_key_id: str = ""
+    aws_secret_access_key: str = ""
+    aws_region: str = "us-east-1"
+    bedrock_model_id: str = "anthropic.claude-3-5-sonnet-20241022-v2:0"
+    elevenlabs_api_key: str = ""
+    elevenlabs_voice_id: str = ""
+    youtube_client_secret_path: str = "client_secret.json"
+    pexels_api_key: str = ""
+    supabase_url: str = ""
+    supabase_key: str = ""
+    youtube_api_key: str = ""
+    discord_webhook_url: str = ""
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Read the environment once and return the cached :class:`Settings`."""
+    return Settings(
+        **{f.name: os.getenv(f.name.upper(), f.default) for f in fields(Settings)}
+    )
+
+
+# Read-only ``{"ENV_VAR_NAME": value}`` view kept for dict-style callers
+settings: Mapping[str, str] = MappingProxyType(
+    {f.name.upper(): getattr(get_settings(), f.name) for f in fields(Settings)}
+)
+
+# ---------------------------------------------------------------------------
+# Lazy client registry
+# ---------------------------------------------------------------------------
+_clients: dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(name: str, factory: Callable[[], Any]) -> Any:
+    """Return the cached client *name*, building it with *factory* on first use.
+
+    A failed build is cached as ``None`` so callers see the same
+    "not initialised" behaviour on every access.
+    """
+    if name in _clients:
+        return _clients[name]
+
+    with _clients_lock:
+        if name not in _clients:
+            try:
+                _clients[name] = factory()
+            except Exception as e:
+                print(f"[config] Failed to create {name} client: {e}")
+                _clients[name] = None
+        return _clients[name]
 
-import boto3
-from dotenv import load_dotenv
-from elevenlabs import ElevenLabs
-from googleapiclient.discovery import build as google_build
-from supabase import Client, create_client
-
-# Load environment variables from .env file
-load_dotenv()
-
-# ---------------------------------------------------------------------------
-# Settings dictionary -- all env vars in one place
-# ---------------------------------------------------------------------------
-settings: dict[str, str] = {
-    "AWS_ACCESS_KEY_ID": os.getenv("AWS_ACCESS_KEY_ID", ""),
-    "AWS_SECRET_ACCESS_KEY": os.getenv("AWS_SECRET_ACCESS_KEY", ""),
-    "AWS_REGION": os.getenv("AWS_REGION", "us-east-1"),
-    "BEDROCK_MODEL_ID": os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-3-5-sonnet-20241022-v2:0"),
-    "ELEVENLABS_API_KEY": os.getenv("ELEVENLABS_API_KEY", ""),
-    "ELEVENLABS_VOICE_ID": os.getenv("ELEVENLABS_VOICE_ID", ""),
-    "YOUTUBE_CLIENT_SECRET_PATH": os.getenv("YOUTUBE_CLIENT_SECRET_PATH", "client_secret.json"),
-    "PEXELS_API_KEY": os.getenv("PEXELS_API_KEY", ""),
-    "SUPABASE_URL": os.getenv("SUPABASE_URL", ""),
-    "SUPABASE_KEY": os.getenv("SUPABASE_KEY", ""),
-    "YOUTUBE_API_KEY": os.getenv("YOUTUBE_API_KEY", ""),
-    "DISCORD_WEBHOOK_URL": os.getenv("DISCORD_WEBHOOK_URL", ""),
-}
 
 # ---------------------------------------------------------------------------
 # AWS Bedrock client
 # ---------------------------------------------------------------------------
-try:
-    bedrock_client = boto3.client(
+def _create_bedrock_client():
+    import boto3
+
+    return boto3.client(
         service_name="bedrock-runtime",
         region_name=settings["AWS_REGION"],
         aws_access_key_id=settings["AWS_ACCESS_KEY_ID"] or None,
         aws_secret_access_key=settings["AWS_SECRET_ACCESS_KEY"] or None,
     )
-except Exception as e:
-    print(f"[config] Failed to create AWS Bedrock client: {e}")
-    bedrock_client = None
+
+
+def get_bedrock_client():
+    """Return the shared AWS Bedrock runtime client, or ``None`` on failure."""
+    return _get_client("AWS Bedrock", _create_bedrock_client)
+
 
 # ---------------------------------------------------------------------------
 # YouTube Data API v3 client
 # ---------------------------------------------------------------------------
-try:
-    if settings["YOUTUBE_API_KEY"]:
-        youtube_client = google_build("youtube", "v3", developerKey=settings["YOUTUBE_API_KEY"])
-    else:
+# Socket timeout (seconds) for the per-thread YouTube Data API transports
+YOUTUBE_HTTP_TIMEOUT = 10
+
+
+def _create_youtube_client():
+    if not settings["YOUTUBE_API_KEY"]:
         print("[config] YOUTUBE_API_KEY not set -- client not initialised.")
-        youtube_client = None
-except Exception as e:
-    print(f"[config] Failed to create YouTube client: {e}")
-    youtube_client = None
+        return None
+
+    from googleapiclient.discovery import build as google_build
+
+    # Use the discovery document bundled with the library instead of
+    # fetching it over the network on every start-up.  The transport is
+    # supplied per request: callers execute over a thread-local
+    # httplib2.Http (see scripts.research), since Http is not thread-safe.
+    return google_build(
+        "youtube",
+        "v3",
+        developerKey=settings["YOUTUBE_API_KEY"],
+        static_discovery=True,
+        cache_discovery=False,
+    )
+
+
+def get_youtube_client():
+    """Return the shared YouTube Data API client, or ``None`` if unavailable."""
+    return _get_client("YouTube", _create_youtube_client)
+
 
 # ---------------------------------------------------------------------------
 # ElevenLabs client
 # ---------------------------------------------------------------------------
-try:
-    elevenlabs_client = ElevenLabs(api_key=settings["ELEVENLABS_API_KEY"] or None)
-except Exception as e:
-    print(f"[config] Failed to create ElevenLabs client: {e}")
-    elevenlabs_client = None
+def _create_elevenlabs_client():
+    from elevenlabs import ElevenLabs
+
+    return ElevenLabs(api_key=settings["ELEVENLABS_API_KEY"] or None)
+
+
+def get_elevenlabs_client():
+    """Return the shared ElevenLabs client, or ``None`` on failure."""
+    return _get_client("ElevenLabs", _create_elevenlabs_client)
+
 
 # ---------------------------------------------------------------------------
 # Supabase client
 # ---------------------------------------------------------------------------
-try:
-    if settings["SUPABASE_URL"] and settings["SUPABASE_KEY"]:
-        supabase_client: Client = create_client(settings["SUPABASE_URL"], settings["SUPABASE_KEY"])
-    else:
+def _create_supabase_client():
+    if not (settings["SUPABASE_URL"] and settings["SUPABASE_KEY"]):
         print("[config] Supabase URL or key not set -- client not initialised.")
-        supabase_client = None
-except Exception as e:
-    print(f"[config] Failed to create Supabase client: {e}")
-    supabase_client = None
+        return None
+
+    from supabase import create_client
+
+    return create_client(settings["SUPABASE_URL"], settings["SUPABASE_KEY"])
+
+
+def get_supabase_client():
+    """Return the shared Supabase client, or ``None`` if unavailable."""
+    return _get_client("Supabase", _create_supabase_client)
 
 
 # ---------------------------------------------------------------------------
-# Connection test helper
+# Pexels HTTP session
 # ---------------------------------------------------------------------------
-def test_connections() -> None:
-    """Test each configured API connection and print status."""
+def _create_pexels_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
-    print("=" * 50)
-    print("  Nexus -- Connection Tests")
-    print("=" * 50)
+    session = requests.Session()
+    session.headers["Authorization"] = settings["PEXELS_API_KEY"]
+    # Keep-alive pool so repeated API calls skip the TCP + TLS handshake,
+    # with automatic retry on rate limiting and transient server errors.
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ),
+    )
+    return session
 
-    # --- AWS Bedrock ---
-    try:
-        if bedrock_client is None:
-            raise RuntimeError("Bedrock client was not initialised")
-        bedrock_client.list_foundation_models(maxResults=1)
-        print("[OK]   AWS Bedrock: connected")
-    except Exception as e:
-        print(f"[FAIL] AWS Bedrock: {e}")
 
-    # --- ElevenLabs ---
-    try:
-        if elevenlabs_client is None:
-            raise RuntimeError("ElevenLabs client was not initialised")
-        elevenlabs_client.voices.get_all()
-        print("[OK]   ElevenLabs: connected")
-    except Exception as e:
-        print(f"[FAIL] ElevenLabs: {e}")
+def get_pexels_session():
+    """Return the shared, connection-pooled ``requests.Session`` for the Pexels API."""
+    return _get_client("Pexels", _create_pexels_session)
 
-    # --- Supabase ---
-    try:
-        if supabase_client is None:
-            raise RuntimeError("Supabase client was not initialised")
-        # Simple health-check query
-        supabase_client.table("pipeline_runs").select("*").limit(1).execute()
-        print("[OK]   Supabase: connected")
-    except Exception as e:
-        print(f"[FAIL] Supabase: {e}")
 
-    # --- Pexels ---
-    try:
-        import requests
+# ---------------------------------------------------------------------------
+# Stock footage download session
+# ---------------------------------------------------------------------------
+def _create_download_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
-        if not settings["PEXELS_API_KEY"]:
-            raise RuntimeError("PEXELS_API_KEY not set")
-        resp = requests.get(
+    # Separate from the Pexels API session: clip URLs point at CDN hosts
+    # and must not receive the API key.  Sized for concurrent clips, each
+    # split into parallel range requests.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_download_session():
+    """Return the shared, connection-pooled ``requests.Session`` for clip downloads."""
+    return _get_client("Download", _create_download_session)
+
+
+_CLIENT_GETTERS = {
+    "bedrock_client": get_bedrock_client,
+    "youtube_client": get_youtube_client,
+    "elevenlabs_client": get_elevenlabs_client,
+    "supabase_client": get_supabase_client,
+    "pexels_session": get_pexels_session,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatibility for ``from config.config import bedrock_client``
+    # and friends (PEP 562); the client is built on first access.
+    getter = _CLIENT_GETTERS.get(name)
+    if getter is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getter()
+
+
+if os.getenv("NEXUS_EAGER_CLIENTS") == "1":
+    for _getter in _CLIENT_GETTERS.values():
+        _getter()
+
+
+# ---------------------------------------------------------------------------
+# Connection test helpers
+# ---------------------------------------------------------------------------
+def _ttl_cache(seconds: float):
+    """Cache a zero-argument function's successful result for *seconds*."""
+
+    def decorator(func):
+        cached: list = []  # [(expires_at, value)]
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper():
+            with lock:
+                if cached and cached[0][0] > time.monotonic():
+                    return cached[0][1]
+                value = func()
+                cached[:] = [(time.monotonic() + seconds, value)]
+                return value
+
+        return wrapper
+
+    return decorator
+
+
+def _create_sts_client():
+    import boto3
+
+    return boto3.client(
+        "sts",
+        region_name=settings["AWS_REGION"],
+        aws_access_key_id=settings["AWS_ACCESS_KEY_ID"] or None,
+        aws_secret_access_key=settings["AWS_SECRET_ACCESS_KEY"] or None,
+    )
+
+
+@_ttl_cache(60.0)
+def _aws_caller_identity() -> dict:
+    """``sts:GetCallerIdentity`` -- a tiny, constant-size credentials check."""
+    sts_client = _get_client("AWS STS", _create_sts_client)
+    if sts_client is None:
+        raise RuntimeError("STS client was not initialised")
+    return sts_client.get_caller_identity()
+
+
+def _check_bedrock() -> str:
+    if get_bedrock_client() is None:
+        raise RuntimeError("Bedrock client was not initialised")
+    # bedrock-runtime has no cheap read-only call; verifying the AWS
+    # credentials it uses is enough for a connectivity check.
+    _aws_caller_identity()
+    return "connected"
+
+
+def _check_elevenlabs() -> str:
+    elevenlabs_client = get_elevenlabs_client()
+    if elevenlabs_client is None:
+        raise RuntimeError("ElevenLabs client was not initialised")
+    elevenlabs_client.voices.get_all()
+    return "connected"
+
+
+def _check_supabase() -> str:
+    supabase_client = get_supabase_client()
+    if supabase_client is None:
+        raise RuntimeError("Supabase client was not initialised")
+    # Simple health-check query
+    supabase_client.table("pipeline_runs").select("*").limit(1).execute()
+    return "connected"
+
+
+@lru_cache(maxsize=1)
+def _pexels_probe_request():
+    """Build the constant Pexels probe request once; it is re-sent as-is."""
+    import requests
+
+    return get_pexels_session().prepare_request(
+        requests.Request(
+            "GET",
             "https://api.pexels.com/v1/search",
-            headers={"Authorization": settings["PEXELS_API_KEY"]},
             params={"query": "test", "per_page": 1},
-            timeout=10,
         )
-        resp.raise_for_status()
-        print("[OK]   Pexels API: connected")
-    except Exception as e:
-        print(f"[FAIL] Pexels API: {e}")
+    )
+
+
+def _check_pexels() -> str:
+    if not settings["PEXELS_API_KEY"]:
+        raise RuntimeError("PEXELS_API_KEY not set")
+    pexels_session = get_pexels_session()
+    if pexels_session is None:
+        raise RuntimeError("Pexels session was not initialised")
+    resp = pexels_session.send(_pexels_probe_request(), timeout=5)
+    resp.raise_for_status()
+    return "connected"
+
+
+def _check_discord() -> str:
+    if not settings["DISCORD_WEBHOOK_URL"]:
+        raise RuntimeError("DISCORD_WEBHOOK_URL not set")
+    return "URL configured"
 
-    # --- Discord Webhook ---
+
+# Probes in the order their results are printed
+_CONNECTION_CHECKS = (
+    ("AWS Bedrock", _check_bedrock),
+    ("ElevenLabs", _check_elevenlabs),
+    ("Supabase", _check_supabase),
+    ("Pexels API", _check_pexels),
+    ("Discord Webhook", _check_discord),
+)
+
+
+def _run_check(name: str, check) -> tuple[str, bool, str]:
+    """Run a single probe, returning ``(name, ok, message)``."""
     try:
-        if not settings["DISCORD_WEBHOOK_URL"]:
-            raise RuntimeError("DISCORD_WEBHOOK_URL not set")
-        print("[OK]   Discord Webhook: URL configured")
+        return name, True, check()
     except Exception as e:
-        print(f"[FAIL] Discord Webhook: {e}")
+        return name, False, str(e)
+
+
+def test_connections() -> None:
+    """Test each configured API connection and print status.
+
+    The probes are independent network round-trips, so they run
+    concurrently and the total wait is bounded by the slowest one.
+    Results are printed in a fixed order once every probe has finished.
+    """
+
+    print("=" * 50)
+    print("  Nexus -- Connection Tests")
+    print("=" * 50)
+
+    with ThreadPoolExecutor(max_workers=len(_CONNECTION_CHECKS)) as executor:
+        futures = [
+            executor.submit(_run_check, name, check)
+            for name, check in _CONNECTION_CHECKS
+        ]
+        results = [future.result() for future in futures]
+
+    for name, ok, message in results:
+        if ok:
+            print(f"[OK]   {name}: {message}")
+        else:
+            print(f"[FAIL] {name}: {message}")
 
     print("=" * 50)
 
@@ -2,24 +2,28 @@
 
 Orchestrates the full video production workflow:
 1. Research a topic
-2. Generate a script
+2. Generate a script (streamed, so stock visuals can start per section)
 3. Create voiceover audio
-4. Fetch stock visuals
+4. Fetch stock visuals (in the background, while the script and voiceover
+   are generated)
 5. Assemble the final video
 6. Upload to YouTube
 7. Send notifications and log the run
 """
 
+import queue
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from scripts.research import research_topic
-from scripts.script import generate_script
-from scripts.audio import generate_voiceover
-from scripts.visuals import download_video, search_stock_videos
-from scripts.editor import assemble_video
-from scripts.upload import upload_video
+from scripts import audio, editor, research, upload, visuals
+from scripts import script as script_writer
 from scripts.notify import log_pipeline_run, send_discord_notification
 
+# Runs pipeline stages that can overlap with work on the main thread.  Kept
+# separate from the per-stage pools (TTS, downloads) so a background stage
+# never waits on a pool it is itself occupying.
+_stage_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="nexus-stage")
+
 
 def run_pipeline(topic: str, niche: str = "general") -> None:
     """Execute the full YouTube automation pipeline for a given topic."""
@@ -28,41 +32,51 @@ def run_pipeline(topic: str, niche: str = "general") -> None:
 
     # Step 1 -- Research
     print("[1/7] Researching topic...")
-    research = research_topic(topic, niche)
-    print(f"  Research complete ({len(research)} chars)")
+    analysis = research.run(niche, query=topic)
+    selected_topic = analysis["selected_topic"]
+    print(f"  Selected topic: {selected_topic}")
 
-    # Step 2 -- Script
+    # Steps 2 + 4 -- the script is streamed and parsed as it is generated;
+    # each section's stock footage is fetched in the background as soon as
+    # its visual_cue is complete, and keeps downloading during the voiceover.
     print("[2/7] Generating script...")
-    script = generate_script(topic, research=research)
-    print(f"  Script generated ({len(script)} chars)")
+    topic_dict = {**analysis, "topic": selected_topic}
+    events: queue.Queue = queue.Queue()
+    visuals_future = _stage_executor.submit(visuals.run_stream, iter(events.get, None))
+    try:
+        for path, value in script_writer.generate_script_stream(topic_dict):
+            events.put((path, value))
+            if path == ():
+                generated = value
+    finally:
+        # End of stream; the visuals stage raises if the script never arrived
+        events.put(None)
+    script_writer.save_script(generated)
+    script = {**topic_dict, **generated}
+    print(f"  Script generated ({len(script.get('sections', []))} sections)")
 
-    # Step 3 -- Audio
     print("[3/7] Generating voiceover...")
-    audio_path = generate_voiceover(script)
+    audio_path = audio.run(script)
     print(f"  Audio saved to {audio_path}")
 
-    # Step 4 -- Visuals
-    print("[4/7] Fetching stock visuals...")
-    videos = search_stock_videos(topic, per_page=5)
-    video_paths = []
-    for i, video in enumerate(videos):
-        path = download_video(video["url"], f"clip_{i}.mp4")
-        video_paths.append(path)
-    print(f"  Downloaded {len(video_paths)} clips")
+    print("[4/7] Waiting for stock visuals...")
+    visuals_map = visuals_future.result()
+    clip_count = sum(len(paths) for paths in visuals_map.values())
+    print(f"  Downloaded {clip_count} clips")
 
     # Step 5 -- Edit
     print("[5/7] Assembling final video...")
-    final_path = assemble_video(video_paths, audio_path)
-    print(f"  Final video at {final_path}")
+    rendered = editor.run(script, visuals_map, audio_path)
+    print(f"  Final video at {rendered['video_path']}")
 
     # Step 6 -- Upload
     print("[6/7] Uploading to YouTube...")
-    video_id = upload_video(
-        video_path=final_path,
-        title=topic,
-        description=f"An AI-generated video about {topic}.",
-        tags=[topic, niche, "AI generated"],
-        privacy_status="private",
+    youtube = upload.authenticate_youtube()
+    video_id = upload.upload_video(
+        youtube,
+        rendered["video_path"],
+        rendered["thumbnail_path"],
+        script,
     )
     video_url = f"https://www.youtube.com/watch?v={video_id}"
     print(f"  Uploaded: {video_url}")
@@ -70,11 +84,11 @@ def run_pipeline(topic: str, niche: str = "general") -> None:
     # Step 7 -- Notify
     print("[7/7] Sending notifications...")
     send_discord_notification(
-        title=f"New Video: {topic}",
+        title=f"New Video: {selected_topic}",
         description=f"Pipeline finished successfully.\n{video_url}",
         url=video_url,
     )
-    log_pipeline_run(topic=topic, status="success", video_id=video_id)
+    log_pipeline_run(topic=selected_topic, status="success", video_id=video_id)
 
     print(f"\n>>> Pipeline complete! Video: {video_url}\n")
 
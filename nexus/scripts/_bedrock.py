@@ -0,0 +1,212 @@
+"""Shared AWS Bedrock helpers for the Nexus pipeline.
+
+Wraps the streaming Claude call used by the research and script stages.
+Responses are cached in-process and on disk, keyed by model, token limit
+and prompt, so re-running the pipeline on the same inputs does not pay
+for the same completion twice.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+
+from config.config import get_bedrock_client, settings
+from scripts import _json
+from scripts._paths import ASSETS_DIR, ensure_dir
+
+CACHE_DIR = os.path.join(ASSETS_DIR, ".bedrock_cache")
+
+ANTHROPIC_VERSION = "bedrock-2023-05-31"
+
+# A whole reply wrapped in a markdown code fence: optional language tag,
+# closing fence optional in case the reply was cut off
+_FENCE_RE = re.compile(r"\A```[A-Za-z]*\n?(.*?)(?:```)?\Z", re.DOTALL)
+
+# Completed replies kept in memory, most recently used last
+MEMORY_CACHE_SIZE = 256
+_memory_cache: OrderedDict[str, str] = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+class ResponseTruncated(RuntimeError):
+    """The reply stopped because it reached ``max_tokens``."""
+
+
+def _cache_key(
+    prompt: str | list, max_tokens: int, stop_sequences: list[str] | None = None
+) -> str:
+    """Content hash identifying one completion request."""
+    if not isinstance(prompt, str):
+        # Content blocks: hash a canonical serialisation
+        prompt = json.dumps(prompt, sort_keys=True)
+    stops = "\x1f".join(stop_sequences or ())
+    digest = hashlib.sha256()
+    digest.update(
+        f"{settings['BEDROCK_MODEL_ID']}\0{max_tokens}\0{stops}\0".encode("utf-8")
+    )
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_disk_cache(key: str) -> str | None:
+    """Return the cached reply for *key*, or ``None`` if absent or unreadable."""
+    try:
+        with open(os.path.join(CACHE_DIR, f"{key}.json"), "r") as f:
+            return _json.loads(f.read())["text"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_disk_cache(key: str, text: str) -> None:
+    """Atomically store the reply *text* under *key*."""
+    ensure_dir(CACHE_DIR)
+    _json.write_atomic(os.path.join(CACHE_DIR, f"{key}.json"), {"text": text})
+
+
+def _cached_reply(key: str) -> str | None:
+    """Look *key* up in the in-process LRU, then on disk."""
+    with _memory_cache_lock:
+        text = _memory_cache.get(key)
+        if text is not None:
+            _memory_cache.move_to_end(key)
+            return text
+
+    text = _read_disk_cache(key)
+    if text is not None:
+        _remember(key, text, persist=False)
+    return text
+
+
+def _remember(key: str, text: str, persist: bool = True) -> None:
+    """Store a completed reply in the in-process LRU (and on disk)."""
+    with _memory_cache_lock:
+        _memory_cache[key] = text
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    if persist:
+        _write_disk_cache(key, text)
+
+
+def _stream_text_deltas(
+    prompt: str | list, max_tokens: int, stop_sequences: list[str] | None = None
+) -> Iterator[str]:
+    """Yield reply text from Bedrock's response stream as it is generated.
+
+    Raises :class:`ResponseTruncated` after the last delta if the reply
+    was cut off by *max_tokens*.
+    """
+    bedrock_client = get_bedrock_client()
+    if bedrock_client is None:
+        raise RuntimeError(
+            "Bedrock client is not initialised. "
+            "Check your AWS credentials in the .env file."
+        )
+
+    request = {
+        "anthropic_version": ANTHROPIC_VERSION,
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    if stop_sequences:
+        request["stop_sequences"] = stop_sequences
+    body = _json.dumpb(request)
+
+    response = bedrock_client.invoke_model_with_response_stream(
+        modelId=settings["BEDROCK_MODEL_ID"],
+        contentType="application/json",
+        accept="application/json",
+        body=body,
+    )
+
+    stop_reason = None
+    for event in response["body"]:
+        chunk = event.get("chunk")
+        if chunk is None:
+            continue
+        # Nearly every event is a text delta: read just the fields needed
+        # instead of materialising the whole envelope, parsing each event once
+        event_type, text, reason = _json.at_pointers(
+            chunk["bytes"], "/type", "/delta/text", "/delta/stop_reason"
+        )
+        if event_type == "content_block_delta":
+            if isinstance(text, str):
+                yield text
+        elif event_type == "message_delta":
+            stop_reason = reason or stop_reason
+
+    if stop_reason == "max_tokens":
+        raise ResponseTruncated(f"Reply reached max_tokens={max_tokens}")
+
+
+def invoke_claude_stream(
+    prompt: str | list,
+    max_tokens: int = 4096,
+    stop_sequences: list[str] | None = None,
+) -> Iterator[str]:
+    """Send *prompt* to Claude on Bedrock and yield the reply as it arrives.
+
+    *prompt* is the user message content: a plain string, or a list of
+    Anthropic content blocks.
+    Generation ends early at any of *stop_sequences*, which are not
+    included in the reply.
+
+    Uses ``invoke_model_with_response_stream``, so callers can start work
+    on the first tokens instead of waiting for the full completion.  A
+    cached reply is yielded in one piece.  The reply is cached once the
+    stream has been consumed to the end; truncated replies are not cached.
+
+    Raises
+    ------
+    RuntimeError
+        If the reply is not cached and the Bedrock client is not initialised.
+    ResponseTruncated
+        After the last delta, if the reply was cut off by *max_tokens*.
+    """
+    key = _cache_key(prompt, max_tokens, stop_sequences)
+    text = _cached_reply(key)
+    if text is not None:
+        print("[bedrock] Using cached response")
+        yield text
+        return
+
+    parts: list[str] = []
+    for delta in _stream_text_deltas(prompt, max_tokens, stop_sequences):
+        parts.append(delta)
+        yield delta
+    _remember(key, "".join(parts))
+
+
+def invoke_claude(
+    prompt: str | list,
+    max_tokens: int = 4096,
+    stop_sequences: list[str] | None = None,
+) -> str:
+    """Send *prompt* to Claude on Bedrock and return the reply text.
+
+    *prompt* and *stop_sequences* are as for :func:`invoke_claude_stream`.
+
+    Identical requests are answered from the in-process LRU cache or the
+    on-disk cache under ``assets/.bedrock_cache/`` without calling Bedrock.
+
+    Raises
+    ------
+    RuntimeError
+        If the reply is not cached and the Bedrock client is not initialised.
+    ResponseTruncated
+        If the reply was cut off by *max_tokens*.
+    """
+    return "".join(invoke_claude_stream(prompt, max_tokens, stop_sequences))
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence (```json ... ```) from *text*."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        match = _FENCE_RE.match(cleaned)
+        cleaned = match.group(1)
+    return cleaned.strip()
@@ -0,0 +1,231 @@
+"""Fast JSON helpers for the Nexus pipeline.
+
+Uses ``orjson`` when it is installed and falls back to the standard
+library otherwise; both paths return the same Python objects.  Keep
+stdlib :mod:`json` for anything that needs ``default=`` or non-string
+keys.  :func:`at_pointers` likewise uses ``pysimdjson`` when available
+to read a few fields without building the whole document.
+"""
+
+import contextlib
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # optional speed-up
+    simdjson = None
+
+# Raised by :func:`loads` on invalid input.  orjson's error subclasses
+# json.JSONDecodeError, so callers can always catch this one.
+JSONDecodeError = json.JSONDecodeError
+
+# simdjson parsers reuse their buffers and are not thread-safe, so each
+# thread gets its own
+_local = threading.local()
+
+
+def loads(data: str | bytes):
+    """Deserialise a JSON document from *data*."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Serialise *obj* to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def dumpb(obj) -> bytes:
+    """Serialise *obj* to compact UTF-8 JSON bytes (e.g. a request body)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def dumpb_indent(obj) -> bytes:
+    """Serialise *obj* to UTF-8 JSON bytes indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _pointer_tokens(pointer: str) -> list[str]:
+    """Split an RFC 6901 JSON pointer into unescaped reference tokens."""
+    if not pointer:
+        return []
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _walk(doc, pointer: str, default):
+    """Resolve *pointer* against the already-parsed *doc*."""
+    for token in _pointer_tokens(pointer):
+        if isinstance(doc, dict):
+            if token not in doc:
+                return default
+            doc = doc[token]
+        elif isinstance(doc, list) and token.isdigit() and int(token) < len(doc):
+            doc = doc[int(token)]
+        else:
+            return default
+    return doc
+
+
+def at_pointers(data: str | bytes, *pointers: str, default=None) -> tuple:
+    """Return the values at each JSON *pointer* (RFC 6901) in *data*.
+
+    Parses *data* once; missing paths give *default*.  With ``pysimdjson``
+    installed only the requested values are converted to Python objects,
+    which is cheaper than :func:`loads` when a few fields of a larger
+    document are needed.
+
+    Raises :class:`ValueError` if *data* is not valid JSON.
+    """
+    if simdjson is None:
+        doc = loads(data)
+        return tuple(_walk(doc, pointer, default) for pointer in pointers)
+
+    parser = getattr(_local, "simdjson_parser", None)
+    if parser is None:
+        parser = _local.simdjson_parser = simdjson.Parser()
+    try:
+        doc = parser.parse(data)
+    except RuntimeError as exc:  # simdjson's parse error
+        raise ValueError(f"Invalid JSON: {exc}") from exc
+
+    values = []
+    for pointer in pointers:
+        try:
+            value = doc.at_pointer(pointer) if pointer else doc
+        except (KeyError, IndexError, TypeError):
+            values.append(default)
+            continue
+        # Containers are views into the parser's buffer; copy them out
+        if isinstance(value, simdjson.Object):
+            value = value.as_dict()
+        elif isinstance(value, simdjson.Array):
+            value = value.as_list()
+        values.append(value)
+    return tuple(values)
+
+
+def write_atomic(path: str, obj, indent: bool = False) -> None:
+    """Write *obj* as JSON to *path* atomically.
+
+    The document is written to a temporary file next to *path* and moved
+    into place with :func:`os.replace`, so readers never see a partial
+    file and a crash mid-write leaves the previous version intact.
+    """
+    payload = dumpb_indent(obj) if indent else dumpb(obj)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+class StreamParser:
+    """Incremental JSON parser that reports each value as soon as it completes.
+
+    Feed text in arbitrary pieces with :meth:`feed`; it returns
+    ``(path, value)`` events for every value finished by that piece, in
+    completion order.  *path* is a tuple of object keys and array indices
+    from the root, so ``("sections", 0, "visual_cue")`` fires as soon as
+    that string's closing quote arrives, well before the document ends.
+    Containers are reported when they close; the root last, with path
+    ``()``.  Text before the first ``{``/``[`` and after the root closes
+    (e.g. a markdown code fence) is ignored.
+    """
+
+    _DELIMITERS = frozenset(" \t\r\n,:]}")
+
+    def __init__(self) -> None:
+        # One frame per open container: [container, key, expecting_key];
+        # key and expecting_key are only used by objects
+        self._stack: list[list] = []
+        self._string: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._scalar: list[str] = []
+        self.root = None
+        self.done = False
+
+    def feed(self, text: str) -> list:
+        """Consume *text* and return the ``(path, value)`` events it completes."""
+        events: list = []
+        for ch in text:
+            if self.done:
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._finish_string(events)
+                    continue
+                self._string.append(ch)
+                continue
+
+            if not self._stack:
+                # Skip anything before the root container opens
+                if ch in "{[":
+                    self._stack.append([{} if ch == "{" else [], None, ch == "{"])
+                continue
+
+            if ch in self._DELIMITERS and self._scalar:
+                self._add_value(loads("".join(self._scalar)), events)
+                self._scalar = []
+
+            if ch == '"':
+                self._in_string = True
+                self._string = []
+            elif ch in "{[":
+                self._stack.append([{} if ch == "{" else [], None, ch == "{"])
+            elif ch in "}]":
+                container = self._stack.pop()[0]
+                self._add_value(container, events)
+            elif ch not in self._DELIMITERS:
+                self._scalar.append(ch)
+        return events
+
+    def _finish_string(self, events: list) -> None:
+        value = loads(f'"{"".join(self._string)}"')
+        frame = self._stack[-1]
+        if frame[2]:  # object key
+            frame[1] = value
+            frame[2] = False
+        else:
+            self._add_value(value, events)
+
+    def _add_value(self, value, events: list) -> None:
+        if not self._stack:
+            self.root = value
+            self.done = True
+            events.append(((), value))
+            return
+
+        path = tuple(
+            len(f[0]) if isinstance(f[0], list) else f[1] for f in self._stack
+        )
+        frame = self._stack[-1]
+        if isinstance(frame[0], list):
+            frame[0].append(value)
+        else:
+            frame[0][frame[1]] = value
+            frame[2] = True
+        events.append((path, value))
@@ -0,0 +1,28 @@
+"""Filesystem locations shared by the Nexus pipeline modules.
+
+Resolved once at import to absolute paths, so they do not depend on the
+working directory the pipeline is started from.  Kept as ``str`` because
+they are handed straight to ffmpeg, ``open`` and the Google client
+libraries.  :func:`ensure_dir` creates output directories on first use.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+NEXUS_DIR = Path(__file__).resolve().parent.parent
+
+ASSETS_DIR = str(NEXUS_DIR / "assets")
+CONFIG_DIR = str(NEXUS_DIR / "config")
+PROMPTS_DIR = str(NEXUS_DIR / "prompts")
+
+
+@lru_cache(maxsize=None)
+def ensure_dir(path: str) -> str:
+    """Create directory *path* (and parents) once per process; returns *path*.
+
+    Later calls for the same path skip the ``mkdir``/``stat`` syscalls,
+    which keeps them out of per-clip and per-segment hot paths.
+    """
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -5,29 +5,86 @@ text-to-speech, then concatenates the segments (with optional background
 music) via ffmpeg-python.
 """
 
+import contextlib
+import hashlib
+import io
 import os
+import shutil
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import singledispatch
 
 import ffmpeg
 
-from config.config import elevenlabs_client, settings
+from config.config import get_elevenlabs_client, get_settings
+from scripts._paths import ASSETS_DIR, ensure_dir
 
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 AUDIO_DIR = os.path.join(ASSETS_DIR, "audio")
 BG_MUSIC_PATH = os.path.join(ASSETS_DIR, "background_music.mp3")
 FINAL_OUTPUT = os.path.join(AUDIO_DIR, "final_voiceover.mp3")
+TTS_CACHE_DIR = os.path.join(AUDIO_DIR, "cache")
 
 # Duration (in seconds) of silence inserted between segments
 SILENCE_GAP = 0.5
 
+# TTS fan-out: worker threads per call, and the number of requests allowed
+# in flight at once across all calls (keep within the ElevenLabs tier's
+# concurrency limit to avoid HTTP 429s).
+TTS_MAX_WORKERS = 8
+TTS_CONCURRENCY = 4
+_TTS_SLOTS = threading.BoundedSemaphore(TTS_CONCURRENCY)
+
+# Block size used when streaming TTS audio to disk.  4 MiB holds about four
+# minutes of 128 kbps MP3, so most segments land in a single write.
+COPY_BUFFER_SIZE = 4 << 20
+
+# ElevenLabs model, and the size cap for the synthesised-audio cache
+TTS_MODEL_ID = "eleven_multilingual_v2"
+TTS_CACHE_MAX_BYTES = 500 * 1024 * 1024
+_cache_locks: dict[str, threading.Lock] = {}
+_cache_locks_guard = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+class _IterReader(io.RawIOBase):
+    """Read-only file object over an iterator of ``bytes`` chunks.
+
+    Lets an ElevenLabs audio stream be handed to :func:`shutil.copyfileobj`,
+    which then writes large blocks instead of one small write per chunk.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            if not self._pending:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                if not chunk:
+                    continue  # an empty chunk is not end of stream
+                self._pending = memoryview(chunk)
+            n = min(len(view) - filled, len(self._pending))
+            view[filled:filled + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            filled += n
+        return filled
+
+
 def _extract_segments(script: dict) -> list[str]:
     """Pull ordered text segments from a script dict.
 
@@ -59,24 +116,209 @@ def _extract_segments(script: dict) -> list[str]:
     return segments
 
 
-def _generate_silence(duration: float, path: str) -> str:
-    """Create a silent MP3 file of *duration* seconds at *path*."""
-    (
-        ffmpeg
-        .input("anullsrc=r=44100:cl=stereo", f="lavfi", t=duration)
-        .output(path, acodec="libmp3lame", ar=44100, ac=2)
-        .overwrite_output()
-        .run(quiet=True)
+def _probe_audio_format(path: str) -> tuple[int, int]:
+    """Return ``(sample_rate, channels)`` of the first audio stream in *path*."""
+    try:
+        info = ffmpeg.probe(path, select_streams="a:0")
+        stream = info["streams"][0]
+        return int(stream["sample_rate"]), int(stream["channels"])
+    except (ffmpeg.Error, KeyError, IndexError, ValueError) as exc:
+        raise RuntimeError(f"ffprobe failed on {path}: {exc}") from exc
+
+
+def _get_silence(duration: float, sample_rate: int, channels: int) -> str:
+    """Return a cached silent MP3 of *duration* seconds, creating it on a miss.
+
+    The file is byte-identical for a given duration and format, so it is
+    generated once and kept in the audio cache directory.
+    """
+    path = os.path.join(
+        TTS_CACHE_DIR, f"silence_{duration}_{sample_rate}_{channels}.mp3"
     )
+    if os.path.isfile(path):
+        os.utime(path)  # mark as recently used for eviction
+        return path
+
+    ensure_dir(TTS_CACHE_DIR)
+    # Unique per call so concurrent runs don't share a temp file, and not
+    # ending in .mp3 so _evict_tts_cache never picks it up mid-write
+    fd, tmp_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, prefix="_silence_", suffix=".tmp")
+    os.close(fd)
+    try:
+        (
+            ffmpeg
+            .input(f"anullsrc=r={sample_rate}:cl=mono", f="lavfi", t=duration)
+            .output(
+                tmp_path, format="mp3", acodec="libmp3lame", ar=sample_rate, ac=channels
+            )
+            .overwrite_output()
+            .run(quiet=True)
+        )
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
     return path
 
 
+def _tts_cache_path(voice_id: str, text: str) -> str:
+    """Return the cache file for *text* spoken by *voice_id*."""
+    key = hashlib.sha256(f"{voice_id}|{TTS_MODEL_ID}|{text}".encode()).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+
+def _cache_key_lock(cache_path: str) -> threading.Lock:
+    """Per-entry lock so identical segments in one run are synthesised once."""
+    with _cache_locks_guard:
+        return _cache_locks.setdefault(cache_path, threading.Lock())
+
+
+@contextlib.contextmanager
+def _atomic_output(path: str):
+    """Yield a temporary path beside *path*, moved over *path* on success.
+
+    ffmpeg's ``-y`` truncates an existing output before writing it, so a
+    crash or failed run would leave a truncated final output behind.  The
+    output is written to a fresh file instead and swapped in with
+    :func:`os.replace` only once it is complete; on failure the temporary
+    file is removed and *path* keeps its previous contents.
+    """
+    ext = os.path.splitext(path)[1]
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix="_out_", suffix=f".tmp{ext}"
+    )
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _evict_tts_cache(max_bytes: int = TTS_CACHE_MAX_BYTES) -> None:
+    """Delete least-recently-used cache entries until under *max_bytes*."""
+    try:
+        entries = [e for e in os.scandir(TTS_CACHE_DIR) if e.name.endswith(".mp3")]
+    except FileNotFoundError:
+        return
+
+    stats = [(e.stat().st_atime, e.stat().st_size, e.path) for e in entries]
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+def _tts_segment(
+    client,
+    index: int,
+    text: str,
+    voice_id: str,
+    out_path: str | None = None,
+) -> tuple[int, str]:
+    """Synthesise one segment to *out_path*; returns ``(index, path)``.
+
+    *out_path* defaults to ``segment_<index>.mp3``.  Audio is looked up in
+    the on-disk TTS cache first; ElevenLabs is only called on a miss, and
+    the result is stored in the cache before being copied into place.
+    The copy is deliberate: a hard link would let any later in-place
+    write to *out_path* rewrite the cached audio as well.
+    """
+    if out_path is None:
+        out_path = os.path.join(AUDIO_DIR, f"segment_{index}.mp3")
+    cache_path = _tts_cache_path(voice_id, text)
+
+    with _cache_key_lock(cache_path):
+        if os.path.isfile(cache_path):
+            print(f"[audio] Segment {index}: using cached audio")
+            os.utime(cache_path)  # mark as recently used for eviction
+        else:
+            with _TTS_SLOTS:
+                print(f"[audio] Generating segment {index} ({len(text)} chars)...")
+                tmp_path = f"{cache_path}.tmp"
+                try:
+                    audio_iter = client.text_to_speech.convert(
+                        voice_id=voice_id,
+                        text=text,
+                        model_id=TTS_MODEL_ID,
+                    )
+                    with open(tmp_path, "wb", buffering=COPY_BUFFER_SIZE) as f:
+                        shutil.copyfileobj(_IterReader(audio_iter), f, COPY_BUFFER_SIZE)
+                    os.replace(tmp_path, cache_path)
+                except Exception as exc:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise RuntimeError(
+                        f"ElevenLabs TTS failed on segment {index}: {exc}"
+                    ) from exc
+
+    with _atomic_output(out_path) as tmp_path:
+        shutil.copyfile(cache_path, tmp_path)
+    return index, out_path
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def generate_voiceover(script: dict) -> list:
-    """Convert each script segment to speech via ElevenLabs.
+def _tts_client_and_voice() -> tuple:
+    """Return ``(elevenlabs_client, voice_id)``, raising if either is missing."""
+    elevenlabs_client = get_elevenlabs_client()
+    if elevenlabs_client is None:
+        raise RuntimeError(
+            "ElevenLabs client is not initialised. "
+            "Set ELEVENLABS_API_KEY in your .env file."
+        )
+
+    voice_id = get_settings().elevenlabs_voice_id
+    if not voice_id:
+        raise RuntimeError("ELEVENLABS_VOICE_ID is not set in your .env file.")
+
+    return elevenlabs_client, voice_id
+
+
+@singledispatch
+def generate_voiceover(script) -> list | str:
+    """Convert a script to speech via ElevenLabs.
+
+    Dispatches on the type of *script*:
+
+    - ``dict`` -- a structured script; each segment is synthesised
+      separately and a list of segment paths is returned, ready for
+      :func:`combine_audio`.
+    - ``str`` -- a single block of narration, synthesised straight to
+      ``assets/audio/final_voiceover.mp3`` with no concat, silence or
+      music mixing; returns that path.
+    """
+    raise TypeError(
+        f"generate_voiceover() expects a script dict or str, "
+        f"not {type(script).__name__}"
+    )
+
+
+@generate_voiceover.register
+def _(text: str) -> str:
+    if not text.strip():
+        raise ValueError("No text provided to convert.")
+
+    elevenlabs_client, voice_id = _tts_client_and_voice()
+    ensure_dir(TTS_CACHE_DIR)
+
+    _, out_path = _tts_segment(elevenlabs_client, 0, text, voice_id, FINAL_OUTPUT)
+    _evict_tts_cache()
+
+    print(f"[audio] Final voiceover saved to {out_path}")
+    return out_path
+
+
+@generate_voiceover.register
+def _(script: dict) -> list:
+    """Synthesise each segment of a structured script.
 
     Parameters
     ----------
@@ -88,53 +330,118 @@ def generate_voiceover(script: dict) -> list:
     list[str]
         Paths to the generated ``assets/audio/segment_<i>.mp3`` files.
     """
-    if elevenlabs_client is None:
-        raise RuntimeError(
-            "ElevenLabs client is not initialised. "
-            "Set ELEVENLABS_API_KEY in your .env file."
-        )
-
-    voice_id = settings.get("ELEVENLABS_VOICE_ID", "")
-    if not voice_id:
-        raise RuntimeError("ELEVENLABS_VOICE_ID is not set in your .env file.")
+    elevenlabs_client, voice_id = _tts_client_and_voice()
 
     segments = _extract_segments(script)
     if not segments:
         raise ValueError("Script produced no text segments to convert.")
 
-    os.makedirs(AUDIO_DIR, exist_ok=True)
-    audio_paths: list[str] = []
+    ensure_dir(TTS_CACHE_DIR)
 
-    for index, text in enumerate(segments):
-        out_path = os.path.join(AUDIO_DIR, f"segment_{index}.mp3")
-        print(f"[audio] Generating segment {index} ({len(text)} chars)...")
+    # Segments are independent HTTP round-trips, so synthesise them
+    # concurrently and restore script order afterwards.
+    results: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=min(TTS_MAX_WORKERS, len(segments))) as executor:
+        futures = [
+            executor.submit(_tts_segment, elevenlabs_client, index, text, voice_id)
+            for index, text in enumerate(segments)
+        ]
+        for future in as_completed(futures):
+            index, out_path = future.result()
+            results[index] = out_path
 
-        try:
-            audio_iter = elevenlabs_client.text_to_speech.convert(
-                voice_id=voice_id,
-                text=text,
-                model_id="eleven_multilingual_v2",
-            )
-            with open(out_path, "wb") as f:
-                for chunk in audio_iter:
-                    f.write(chunk)
-        except Exception as exc:
-            raise RuntimeError(
-                f"ElevenLabs TTS failed on segment {index}: {exc}"
-            ) from exc
-
-        audio_paths.append(out_path)
+    audio_paths = [results[index] for index in sorted(results)]
+    _evict_tts_cache()
 
     print(f"[audio] Generated {len(audio_paths)} audio segments")
     return audio_paths
 
 
+def _mix_with_music(audio_files: list) -> None:
+    """Concatenate, add silences and mix in background music in one encode.
+
+    Everything happens in a single ffmpeg ``filter_complex`` graph: the
+    silences are generated in-graph and the result is encoded once,
+    straight to the final file.
+    """
+    # Interleave segments with in-graph silence, normalised to one format
+    # so the concat filter sees identical stream parameters.
+    streams = []
+    for i, path in enumerate(audio_files):
+        if i > 0:
+            streams.append(
+                ffmpeg.input(
+                    f"aevalsrc=0:c=stereo:s=44100:d={SILENCE_GAP}", f="lavfi"
+                ).audio
+            )
+        streams.append(
+            ffmpeg.input(path).audio.filter(
+                "aformat", sample_rates=44100, channel_layouts="stereo"
+            )
+        )
+    voice = ffmpeg.concat(*streams, v=0, a=1)
+
+    music = ffmpeg.input(BG_MUSIC_PATH, stream_loop=-1).audio
+    # Loop music under the voiceover, reduce to 10% volume
+    music_quiet = music.filter("volume", 0.1)
+    mixed = ffmpeg.filter([voice, music_quiet], "amix", inputs=2, duration="first")
+
+    try:
+        with _atomic_output(FINAL_OUTPUT) as tmp_path:
+            (
+                ffmpeg
+                .output(mixed, tmp_path, acodec="libmp3lame", ar=44100, ac=2)
+                .overwrite_output()
+                .run(quiet=True)
+            )
+    except ffmpeg.Error as exc:
+        raise RuntimeError(f"ffmpeg background mix failed: {exc}") from exc
+
+
+def _concat_copy(audio_files: list) -> None:
+    """Join segments and silences with the concat demuxer, without re-encoding.
+
+    The segments all come from the same ElevenLabs output format, so the
+    first one is probed once and a matching cached silence gap is used;
+    the MP3 frames are then stream-copied into the final file.
+    """
+    sample_rate, channels = _probe_audio_format(audio_files[0])
+    # Paths need to be absolute for the concat demuxer
+    silence_path = os.path.abspath(_get_silence(SILENCE_GAP, sample_rate, channels))
+
+    # Interleave segments with silence and write the list in one go; a
+    # uniquely-named temp file avoids clashes with concurrent or crashed runs.
+    entries = [silence_path] * (2 * len(audio_files) - 1)
+    entries[::2] = [os.path.abspath(path) for path in audio_files]
+    payload = "".join(f"file '{entry}'\n" for entry in entries)
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", prefix="_concat_", dir=AUDIO_DIR, delete=False
+    ) as f:
+        f.write(payload)
+    concat_list_path = f.name
+
+    try:
+        with _atomic_output(FINAL_OUTPUT) as tmp_path:
+            (
+                ffmpeg
+                .input(concat_list_path, f="concat", safe=0)
+                .output(tmp_path, acodec="copy")
+                .overwrite_output()
+                .run(quiet=True)
+            )
+    except ffmpeg.Error as exc:
+        raise RuntimeError(f"ffmpeg concat failed: {exc}") from exc
+    finally:
+        os.unlink(concat_list_path)
+
+
 def combine_audio(audio_files: list) -> str:
     """Concatenate segment MP3s with silence gaps and optional background music.
 
     A 0.5-second silence is inserted between each segment for natural
     pacing.  If ``assets/background_music.mp3`` exists it is mixed in at
-    10 % volume underneath the voiceover.
+    10 % volume underneath the voiceover, which needs a single re-encode;
+    otherwise the segments are stream-copied and never re-encoded.
 
     Parameters
     ----------
@@ -149,82 +456,35 @@ def combine_audio(audio_files: list) -> str:
     if not audio_files:
         raise ValueError("No audio files provided to combine.")
 
-    os.makedirs(AUDIO_DIR, exist_ok=True)
-
-    # Build a concat list interleaving segments with silence
-    concat_entries: list[str] = []
-    silence_path = os.path.join(AUDIO_DIR, "_silence.mp3")
-    _generate_silence(SILENCE_GAP, silence_path)
+    ensure_dir(AUDIO_DIR)
 
-    for i, path in enumerate(audio_files):
-        concat_entries.append(path)
-        if i < len(audio_files) - 1:
-            concat_entries.append(silence_path)
-
-    # Write ffmpeg concat demuxer file
-    concat_list_path = os.path.join(AUDIO_DIR, "_concat_list.txt")
-    with open(concat_list_path, "w") as f:
-        for entry in concat_entries:
-            # Paths need to be absolute for the concat demuxer
-            abs_path = os.path.abspath(entry)
-            f.write(f"file '{abs_path}'\n")
-
-    # Concatenate all segments + silences into a single file
-    concat_tmp = os.path.join(AUDIO_DIR, "_concat_tmp.mp3")
-    try:
-        (
-            ffmpeg
-            .input(concat_list_path, f="concat", safe=0)
-            .output(concat_tmp, acodec="libmp3lame", ar=44100, ac=2)
-            .overwrite_output()
-            .run(quiet=True)
-        )
-    except ffmpeg.Error as exc:
-        raise RuntimeError(f"ffmpeg concat failed: {exc}") from exc
-
-    # Mix in background music if available
     if os.path.isfile(BG_MUSIC_PATH):
         print("[audio] Mixing in background music at 10% volume...")
-        try:
-            voice = ffmpeg.input(concat_tmp)
-            music = ffmpeg.input(BG_MUSIC_PATH, stream_loop=-1)
-            # Trim music to match voiceover length, reduce to 10% volume
-            music_quiet = music.filter("volume", 0.1)
-            (
-                ffmpeg
-                .filter([voice, music_quiet], "amix", inputs=2, duration="first")
-                .output(FINAL_OUTPUT, acodec="libmp3lame", ar=44100, ac=2)
-                .overwrite_output()
-                .run(quiet=True)
-            )
-        except ffmpeg.Error as exc:
-            raise RuntimeError(f"ffmpeg background mix failed: {exc}") from exc
+        _mix_with_music(audio_files)
     else:
-        # No background music -- just rename the concat output
-        os.replace(concat_tmp, FINAL_OUTPUT)
-
-    # Clean up temp files
-    for tmp in (silence_path, concat_list_path, concat_tmp):
-        if os.path.exists(tmp):
-            os.remove(tmp)
+        _concat_copy(audio_files)
 
     print(f"[audio] Final voiceover saved to {FINAL_OUTPUT}")
     return FINAL_OUTPUT
 
 
-def run(script: dict) -> str:
+def run(script: dict | str) -> str:
     """Run the full audio step: generate segments then combine.
 
     Parameters
     ----------
     script:
-        Structured script dict (hook, sections, cta).
+        Structured script dict (hook, sections, cta), or plain narration
+        text, which is synthesised in one piece with nothing to combine.
 
     Returns
     -------
     str
         Path to the final combined audio file.
     """
+    if isinstance(script, str):
+        return generate_voiceover(script)
+
     audio_files = generate_voiceover(script)
     final_path = combine_audio(audio_files)
     return final_path
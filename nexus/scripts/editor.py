@@ -1,19 +1,27 @@
 """Video editor module for the Nexus YouTube automation pipeline.
 
-Assembles the final video from section clips and voiceover audio using
+Assembles the final video from raw footage and voiceover audio using
 ffmpeg-python, and generates a YouTube thumbnail with Pillow.
 """
 
 import json
 import os
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import ffmpeg
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from scripts._paths import ASSETS_DIR, ensure_dir
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 VIDEO_DIR = os.path.join(ASSETS_DIR, "video")
 FINAL_DIR = os.path.join(ASSETS_DIR, "final")
 FINAL_VIDEO = os.path.join(FINAL_DIR, "final_video.mp4")
@@ -25,13 +33,67 @@ HEIGHT = 1080
 FPS = 24
 CHANNEL_NAME = "Nexus"
 
+# H.264 encoders, most preferred first, with encoder-specific tuning.
+# h264_vaapi is not listed: it needs an explicit hwupload stage in the
+# filter graph rather than a drop-in codec swap.
+H264_HW_ENCODERS = (
+    ("h264_nvenc", {"preset": "p1", "tune": "ll", "rc": "vbr", "cq": 23, "pix_fmt": "yuv420p"}),
+    ("h264_videotoolbox", {"realtime": "true", "pix_fmt": "yuv420p"}),
+    ("h264_qsv", {"preset": "veryfast", "global_quality": 23, "pix_fmt": "nv12"}),
+    ("h264_amf", {"quality": "speed", "pix_fmt": "yuv420p"}),
+)
+
+# Input options enabling hardware decode alongside a hardware encoder.
+# Frames are still downloaded to system memory (no hwaccel_output_format)
+# because scale/pad/drawtext run on the CPU.
+H264_HW_DECODE = {
+    "h264_nvenc": {"hwaccel": "cuda"},
+}
+H264_SW_ENCODER = ("libx264", {"pix_fmt": "yuv420p"})
+
+# libx264 tuning for the delivered video
+X264_FINAL_OPTS = {"preset": "veryfast", "crf": 23}
+
+# Maximum concurrent ffprobe processes
+PROBE_WORKERS = 8
+
+# An ffmpeg run whose progress report stops advancing for this many seconds
+# is treated as hung and killed; progress is logged at the given interval.
+FFMPEG_STALL_TIMEOUT = 60.0
+FFMPEG_PROGRESS_LOG_INTERVAL = 10.0
+
+# Slate text size
+SLATE_FONT_SIZE = 64
+
+# Thumbnail title fonts, most preferred first, and candidate sizes
+PREFERRED_TITLE_FONTS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+)
+TITLE_FONT_SIZES = (72, 60, 48, 36)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 def _probe_duration(path: str) -> float:
-    """Return the duration of a media file in seconds."""
+    """Return the duration of a media file in seconds.
+
+    Results are memoised per ``(path, mtime, size)``, so repeated probes of
+    an unchanged file skip the ``ffprobe`` subprocess.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0.0
+    return _probe_duration_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _probe_duration_cached(path: str, mtime_ns: int, size: int) -> float:
+    """Probe *path*; *mtime_ns* and *size* only key the cache."""
     try:
         info = ffmpeg.probe(path)
         return float(info["format"]["duration"])
@@ -39,253 +101,345 @@ def _probe_duration(path: str) -> float:
         return 0.0
 
 
+@lru_cache(maxsize=None)
+def _pick_h264_encoder() -> tuple[str, tuple]:
+    """Return the preferred working H.264 encoder and its output options.
+
+    Hardware encoders are tried in order of preference.  Being listed by
+    ``ffmpeg -encoders`` only means support was compiled in, so each
+    candidate must also encode a single test frame before it is chosen.
+    Falls back to ``libx264``.  The result is cached for the process.
+    """
+    try:
+        listing = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        listing = ""
+
+    for name, opts in H264_HW_ENCODERS:
+        if f" {name} " not in listing:
+            continue
+        try:
+            (
+                ffmpeg
+                .input("color=c=black:s=256x256:d=0.1", f="lavfi")
+                .output("-", format="null", vcodec=name, vframes=1, **opts)
+                .run(quiet=True)
+            )
+        except ffmpeg.Error:
+            continue
+        _log(f"Using hardware H.264 encoder: {name}")
+        return name, tuple(opts.items())
+
+    name, opts = H264_SW_ENCODER
+    return name, tuple(opts.items())
+
+
+def _h264_output_args() -> dict:
+    """Keyword arguments selecting the H.264 encoder for an ``.output()`` call.
+
+    libx264 gets the delivery-quality settings; hardware encoders keep
+    their own options.
+    """
+    name, opts = _pick_h264_encoder()
+    args = {"vcodec": name, **dict(opts)}
+    if name == H264_SW_ENCODER[0]:
+        args.update(X264_FINAL_OPTS)
+    return args
+
+
+def _hw_decode_opts() -> dict:
+    """Input options for hardware decoding matching the chosen encoder."""
+    name, _ = _pick_h264_encoder()
+    return H264_HW_DECODE.get(name, {})
+
+
+def _run_ffmpeg(stream, stall_timeout: float = FFMPEG_STALL_TIMEOUT) -> None:
+    """Run an ffmpeg-python output *stream*, watching its progress report.
+
+    ffmpeg writes machine-readable ``key=value`` progress blocks to stdout
+    (``-progress pipe:1``).  A monitor thread records when the frame count
+    or output time last advanced; if nothing moves for *stall_timeout*
+    seconds the process is killed, so a bad input fails fast instead of
+    blocking the pipeline.  Frame rate and speed are logged periodically.
+
+    Raises
+    ------
+    ffmpeg.Error
+        If ffmpeg exits non-zero (as ``.run()`` would).
+    RuntimeError
+        If ffmpeg stalls and is killed.
+    """
+    cmd = stream.global_args("-progress", "pipe:1", "-nostats").compile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    progress: dict[str, str] = {}
+    last_advance = time.monotonic()
+    stderr_tail: deque = deque(maxlen=200)
+
+    def _read_progress() -> None:
+        nonlocal last_advance
+        position = None
+        for raw in proc.stdout:
+            key, _, value = raw.decode("utf-8", "replace").strip().partition("=")
+            progress[key] = value
+            if key == "progress":  # end of one report block
+                current = (progress.get("frame"), progress.get("out_time_us"))
+                if current != position:
+                    position = current
+                    last_advance = time.monotonic()
+
+    def _read_stderr() -> None:
+        for raw in proc.stderr:
+            stderr_tail.append(raw)
+
+    readers = [
+        threading.Thread(target=_read_progress, daemon=True),
+        threading.Thread(target=_read_stderr, daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    last_log = time.monotonic()
+    while True:
+        try:
+            proc.wait(timeout=1.0)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+
+        now = time.monotonic()
+        if now - last_advance > stall_timeout:
+            proc.kill()
+            proc.wait()
+            raise RuntimeError(
+                f"ffmpeg made no progress for {stall_timeout:.0f}s and was killed"
+            )
+        if now - last_log >= FFMPEG_PROGRESS_LOG_INTERVAL:
+            _log(
+                f"ffmpeg frame={progress.get('frame', '?')} "
+                f"fps={progress.get('fps', '?')} speed={progress.get('speed', '?')}"
+            )
+            last_log = now
+
+    for reader in readers:
+        reader.join()
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", b"", b"".join(stderr_tail))
+
+
+def _probe_durations(paths: list) -> list[float]:
+    """Probe several media files concurrently, preserving input order.
+
+    Each probe is an independent ``ffprobe`` subprocess, so running them
+    on a thread pool overlaps the process start-up and file reads.
+    """
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(paths))) as executor:
+        return list(executor.map(_probe_duration, paths))
+
+
 def _log(msg: str) -> None:
     print(f"[editor] {msg}")
 
 
 # ---------------------------------------------------------------------------
-# Section clip creation
+# Filter-graph building blocks
 # ---------------------------------------------------------------------------
 
-def create_section_clip(
-    video_paths: list,
-    duration: float,
-    section_title: str,
-    section_index: int = 0,
-) -> str:
-    """Trim and concatenate raw footage into a single section clip.
+def _escape_drawtext(text: str) -> str:
+    """Escape special characters in *text* for ffmpeg drawtext."""
+    return text.replace("'", "'\\''").replace(":", "\\:")
 
-    Each clip is scaled to 1920x1080. If the combined footage is shorter
-    than *duration* the last clip is looped; if longer it is trimmed.
-    A small semi-transparent title overlay is burned in at the bottom-left.
 
-    Parameters
-    ----------
-    video_paths:
-        Raw footage file paths for this section.
-    duration:
-        Target duration in seconds.
-    section_title:
-        Text to overlay on the clip.
-    section_index:
-        Used in the output filename.
+def _plan_section_footage(video_paths: list, duration: float) -> tuple[list, bool]:
+    """Pick the footage needed to fill *duration* seconds.
 
-    Returns
-    -------
-    str
-        Path to ``assets/video/section_<index>.mp4``.
+    Returns ``(entries, loop)``: the usable clips in order, stopping once
+    *duration* is covered, and whether they fall short and must be looped.
     """
-    if not video_paths:
-        raise ValueError(f"No video paths provided for section {section_index}")
-
-    os.makedirs(VIDEO_DIR, exist_ok=True)
-    out_path = os.path.join(VIDEO_DIR, f"section_{section_index}.mp4")
-
-    # Build a concat list, trimming / looping to fill *duration*
-    concat_list_path = os.path.join(VIDEO_DIR, f"_concat_{section_index}.txt")
     remaining = duration
-
     entries: list[str] = []
-    for vpath in video_paths:
+    for vpath, clip_dur in zip(video_paths, _probe_durations(video_paths)):
         if remaining <= 0:
             break
-        clip_dur = _probe_duration(vpath)
         if clip_dur <= 0:
             continue
         entries.append(vpath)
         remaining -= clip_dur
+    return entries, remaining > 0
 
-    # If we still have time left, loop from the beginning
-    idx = 0
-    while remaining > 0 and entries:
-        entries.append(entries[idx % len(entries)])
-        remaining -= _probe_duration(entries[idx % len(entries)])
-        idx += 1
 
-    with open(concat_list_path, "w") as f:
-        for entry in entries:
-            f.write(f"file '{os.path.abspath(entry)}'\n")
+def _write_concat_list(entries: list, path: str) -> None:
+    """Write an ffmpeg concat demuxer list of *entries* to *path*."""
+    cwd = os.getcwd()
+    lines = "".join(
+        f"file '{entry if os.path.isabs(entry) else os.path.join(cwd, entry)}'\n"
+        for entry in entries
+    )
+    with open(path, "w") as f:
+        f.write(lines)
 
-    # Concatenate, scale, trim to exact duration, and burn in title text
-    _log(f"Creating section {section_index} clip ({duration:.1f}s)...")
 
-    # Escape special characters in the title for ffmpeg drawtext
-    safe_title = section_title.replace("'", "'\\''").replace(":", "\\:")
+def _section_stream(concat_list_path: str, loop: bool, duration: float, title: str):
+    """Video stream for one section: footage scaled, trimmed and titled.
 
-    try:
-        (
-            ffmpeg
-            .input(concat_list_path, f="concat", safe=0)
-            .filter("scale", WIDTH, HEIGHT, force_original_aspect_ratio="decrease")
-            .filter("pad", WIDTH, HEIGHT, "(ow-iw)/2", "(oh-ih)/2")
-            .filter("setsar", 1)
-            .filter(
-                "drawtext",
-                text=safe_title,
-                fontsize=28,
-                fontcolor="white@0.7",
-                x=40,
-                y=HEIGHT - 60,
-                borderw=1,
-                bordercolor="black@0.5",
-            )
-            .output(
-                out_path,
-                t=duration,
-                vcodec="libx264",
-                pix_fmt="yuv420p",
-                preset="fast",
-                r=FPS,
-                an=None,  # no audio for section clips
-            )
-            .overwrite_output()
-            .run(quiet=True)
+    If the footage is too short (*loop*), ffmpeg loops the concat input
+    lazily while encoding and the trim stops it at *duration*.
+    """
+    input_opts = {"stream_loop": -1} if loop else {}
+    input_opts.update(_hw_decode_opts())
+    return (
+        ffmpeg
+        .input(concat_list_path, f="concat", safe=0, **input_opts)
+        .video
+        .filter("scale", WIDTH, HEIGHT, force_original_aspect_ratio="decrease")
+        .filter("pad", WIDTH, HEIGHT, "(ow-iw)/2", "(oh-ih)/2")
+        .filter("setsar", 1)
+        .filter("fps", FPS)
+        .trim(duration=duration)
+        .setpts("PTS-STARTPTS")
+        .filter(
+            "drawtext",
+            text=_escape_drawtext(title),
+            fontsize=28,
+            fontcolor="white@0.7",
+            x=40,
+            y=HEIGHT - 60,
+            borderw=1,
+            bordercolor="black@0.5",
         )
-    except ffmpeg.Error as exc:
-        raise RuntimeError(
-            f"FFmpeg failed creating section {section_index}: {exc}"
-        ) from exc
-    finally:
-        if os.path.exists(concat_list_path):
-            os.remove(concat_list_path)
+    )
 
-    _log(f"Section {section_index} clip saved to {out_path}")
+
+def _write_slate_image(text: str, out_path: str) -> str:
+    """Render a black frame with centred white *text* to a PNG at *out_path*."""
+    img = Image.new("RGB", (WIDTH, HEIGHT), color=(0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    font = _load_title_font(SLATE_FONT_SIZE)
+    bbox = draw.textbbox((0, 0), text, font=font)
+    x = (WIDTH - (bbox[2] - bbox[0])) // 2 - bbox[0]
+    y = (HEIGHT - (bbox[3] - bbox[1])) // 2 - bbox[1]
+    draw.text((x, y), text, fill=(255, 255, 255), font=font)
+    img.save(out_path, "PNG", compress_level=1)
     return out_path
 
 
-# ---------------------------------------------------------------------------
-# Final video assembly
-# ---------------------------------------------------------------------------
+def _slate_stream(image_path: str, duration: float):
+    """Video stream showing the still *image_path* for *duration* seconds."""
+    return (
+        ffmpeg
+        .input(image_path, loop=1, t=duration, framerate=FPS)
+        .video
+        .filter("setsar", 1)
+    )
+
+
+def _outro_text(script: dict) -> str:
+    """CTA text for the outro slate, falling back when it is too long."""
+    cta_text = script.get("cta", "Subscribe for more!")
+    if len(cta_text) > 60:
+        cta_text = "Subscribe for more!"
+    return cta_text
 
-def _create_slate(text: str, duration: float, out_path: str) -> str:
-    """Create a black-background slate with centred white text."""
-    _log(f"Creating slate: '{text}' ({duration}s)")
-    try:
-        (
-            ffmpeg
-            .input(
-                f"color=c=black:s={WIDTH}x{HEIGHT}:d={duration}:r={FPS}",
-                f="lavfi",
-            )
-            .filter(
-                "drawtext",
-                text=text.replace("'", "'\\''").replace(":", "\\:"),
-                fontsize=64,
-                fontcolor="white",
-                x="(w-text_w)/2",
-                y="(h-text_h)/2",
-            )
-            .output(
-                out_path,
-                vcodec="libx264",
-                pix_fmt="yuv420p",
-                preset="fast",
-                r=FPS,
-                an=None,
-            )
-            .overwrite_output()
-            .run(quiet=True)
-        )
-    except ffmpeg.Error as exc:
-        raise RuntimeError(f"FFmpeg slate creation failed: {exc}") from exc
-    return out_path
+
+def _per_section_duration(audio_path: str, num_sections: int) -> float:
+    """Split the voiceover length (minus intro/outro) evenly across sections."""
+    audio_dur = _probe_duration(audio_path)
+    num_sections = max(num_sections, 1)
+    # Reserve 7 seconds for intro (2s) + outro (5s)
+    content_dur = max(audio_dur - 7.0, num_sections * 5.0)
+    return content_dur / num_sections
 
 
-def assemble_video(section_clips: list, audio_path: str, script: dict) -> str:
-    """Concatenate section clips with intro/outro and overlay voiceover.
+# ---------------------------------------------------------------------------
+# Final video rendering
+# ---------------------------------------------------------------------------
 
-    Layout:
-    - 2 s intro (black + channel name)
-    - all section clips back-to-back
-    - 5 s outro (black + subscribe CTA)
-    - voiceover audio mixed over the full timeline
+def render_final(script: dict, visuals_map: dict, audio_path: str) -> str:
+    """Render the final video from raw footage in a single ffmpeg pass.
 
-    Output: ``assets/final/final_video.mp4`` at 1920x1080, H.264 + AAC.
+    Builds one ``filter_complex`` graph -- intro slate, every section's
+    footage (scaled, padded, trimmed and titled), outro slate, all joined
+    with the concat filter -- and encodes it once together with the
+    voiceover.  No intermediate section or slate files are written, so
+    each frame is decoded and encoded only once.
 
     Parameters
     ----------
-    section_clips:
-        Ordered list of section clip paths.
-    audio_path:
-        Path to the combined voiceover MP3/WAV.
     script:
-        The structured script dict (used for title / CTA text).
+        Structured script dict (section titles and CTA text).
+    visuals_map:
+        Section-index-to-file-paths mapping (from visuals step).
+    audio_path:
+        Path to the combined voiceover audio.
 
     Returns
     -------
     str
-        Path to the final video.
+        Path to ``assets/final/final_video.mp4``.
     """
-    if not section_clips:
-        raise ValueError("No section clips to assemble.")
-
-    os.makedirs(FINAL_DIR, exist_ok=True)
+    sections = script.get("sections", [])
+    per_section = _per_section_duration(audio_path, len(sections))
 
-    # Create intro and outro slates
-    intro_path = os.path.join(VIDEO_DIR, "_intro.mp4")
-    outro_path = os.path.join(VIDEO_DIR, "_outro.mp4")
+    # Probe all footage in one concurrent batch to warm the duration cache
+    _probe_durations([p for paths in visuals_map.values() for p in paths])
 
-    _create_slate(CHANNEL_NAME, 2.0, intro_path)
+    ensure_dir(VIDEO_DIR)
+    ensure_dir(FINAL_DIR)
 
-    cta_text = script.get("cta", "Subscribe for more!")
-    if len(cta_text) > 60:
-        cta_text = "Subscribe for more!"
-    _create_slate(cta_text, 5.0, outro_path)
-
-    # Build concat file: intro + sections + outro
-    all_clips = [intro_path] + list(section_clips) + [outro_path]
-    concat_path = os.path.join(VIDEO_DIR, "_final_concat.txt")
-    with open(concat_path, "w") as f:
-        for clip in all_clips:
-            f.write(f"file '{os.path.abspath(clip)}'\n")
-
-    # Concatenate video (no audio yet)
-    video_only = os.path.join(VIDEO_DIR, "_video_only.mp4")
-    _log("Concatenating all clips...")
+    intro_image = os.path.join(VIDEO_DIR, "_intro.png")
+    outro_image = os.path.join(VIDEO_DIR, "_outro.png")
+    concat_lists: list[str] = []
     try:
-        (
-            ffmpeg
-            .input(concat_path, f="concat", safe=0)
-            .output(
-                video_only,
-                vcodec="libx264",
-                pix_fmt="yuv420p",
-                preset="fast",
-                r=FPS,
-                an=None,
-            )
-            .overwrite_output()
-            .run(quiet=True)
-        )
-    except ffmpeg.Error as exc:
-        raise RuntimeError(f"FFmpeg concat failed: {exc}") from exc
+        _write_slate_image(CHANNEL_NAME, intro_image)
+        streams = [_slate_stream(intro_image, 2.0)]
 
-    # Mux voiceover audio onto video
-    _log("Muxing voiceover audio...")
-    video_dur = _probe_duration(video_only)
-    try:
-        video_in = ffmpeg.input(video_only)
-        audio_in = ffmpeg.input(audio_path)
-        (
+        for idx, section in enumerate(sections):
+            paths = visuals_map.get(str(idx), visuals_map.get(idx, []))
+            entries, loop = _plan_section_footage(paths, per_section)
+            if not entries:
+                _log(f"Section {idx} has no usable footage, skipping")
+                continue
+
+            concat_list_path = os.path.join(VIDEO_DIR, f"_concat_{idx}.txt")
+            _write_concat_list(entries, concat_list_path)
+            concat_lists.append(concat_list_path)
+
+            title = section.get("title", f"Section {idx + 1}")
+            streams.append(_section_stream(concat_list_path, loop, per_section, title))
+
+        if not concat_lists:
+            raise RuntimeError("No section clips were created -- cannot assemble video.")
+
+        _write_slate_image(_outro_text(script), outro_image)
+        streams.append(_slate_stream(outro_image, 5.0))
+
+        _log(f"Rendering {len(concat_lists)} sections in a single pass...")
+        video = ffmpeg.concat(*streams, v=1, a=0)
+        audio = ffmpeg.input(audio_path).audio
+        _run_ffmpeg(
             ffmpeg
             .output(
-                video_in.video,
-                audio_in.audio,
+                video,
+                audio,
                 FINAL_VIDEO,
-                vcodec="copy",
+                r=FPS,
+                **_h264_output_args(),
                 acodec="aac",
                 shortest=None,
             )
             .overwrite_output()
-            .run(quiet=True)
         )
     except ffmpeg.Error as exc:
-        raise RuntimeError(f"FFmpeg audio mux failed: {exc}") from exc
-
-    # Clean up temp files
-    for tmp in (intro_path, outro_path, concat_path, video_only):
-        if os.path.exists(tmp):
-            os.remove(tmp)
+        raise RuntimeError(f"FFmpeg render failed: {exc}") from exc
+    finally:
+        for tmp in (*concat_lists, intro_image, outro_image):
+            if os.path.exists(tmp):
+                os.remove(tmp)
 
     _log(f"Final video saved to {FINAL_VIDEO}")
     return FINAL_VIDEO
@@ -295,6 +449,23 @@ def assemble_video(section_clips: list, audio_path: str, script: dict) -> str:
 # Thumbnail generation
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
+def _load_title_font(size: int = 72):
+    """Return the bold title font at *size*, loaded once per size.
+
+    Tries the preferred system fonts in order, then Arial, then Pillow's
+    built-in default.
+    """
+    for fpath in PREFERRED_TITLE_FONTS:
+        if os.path.exists(fpath):
+            return ImageFont.truetype(fpath, size)
+
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
 def generate_thumbnail(script: dict) -> str:
     """Create a 1280x720 YouTube thumbnail with Pillow.
 
@@ -312,69 +483,50 @@ def generate_thumbnail(script: dict) -> str:
     str
         Path to ``assets/final/thumbnail.jpg``.
     """
-    os.makedirs(FINAL_DIR, exist_ok=True)
+    ensure_dir(FINAL_DIR)
 
     thumb_w, thumb_h = 1280, 720
 
-    # Dark gradient background
-    img = Image.new("RGB", (thumb_w, thumb_h), color=(15, 15, 25))
+    # Dark vertical gradient background, built as one array
+    alpha = (40 * np.arange(thumb_h)) // thumb_h
+    row = np.stack([alpha, alpha, alpha + 10], axis=-1).astype(np.uint8)
+    pixels = np.broadcast_to(row[:, None, :], (thumb_h, thumb_w, 3))
+    img = Image.fromarray(np.ascontiguousarray(pixels), "RGB")
     draw = ImageDraw.Draw(img)
 
-    # Add a subtle gradient overlay
-    for y in range(thumb_h):
-        alpha = int(40 * (y / thumb_h))
-        draw.line([(0, y), (thumb_w, y)], fill=(alpha, alpha, alpha + 10))
-
     # Determine title text
     title = script.get("selected_topic", "")
     if not title:
         sections = script.get("sections", [])
         title = sections[0].get("title", "Video") if sections else "Video"
 
-    # Try to use a bold system font; fall back to default
-    font = None
-    font_sizes = [72, 60, 48, 36]
-    preferred_fonts = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-        "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
-    ]
-
-    for fpath in preferred_fonts:
-        if os.path.exists(fpath):
-            font = ImageFont.truetype(fpath, font_sizes[0])
-            break
-
-    if font is None:
-        try:
-            font = ImageFont.truetype("arial.ttf", font_sizes[0])
-        except OSError:
-            font = ImageFont.load_default()
-
-    # Word-wrap the title to fit within the image
-    max_chars_per_line = 28
-    words = title.split()
-    lines: list[str] = []
-    current_line = ""
-    for word in words:
-        test = f"{current_line} {word}".strip()
-        if len(test) > max_chars_per_line and current_line:
-            lines.append(current_line)
-            current_line = word
+    font = _load_title_font(TITLE_FONT_SIZES[0])
+
+    # Word-wrap the title to the image width, measuring in pixels
+    max_px = thumb_w - 120
+    space_px = font.getlength(" ")
+    lines: list[tuple[str, float]] = []
+    current_line, line_px = "", 0.0
+    for word in title.split():
+        word_px = font.getlength(word)
+        if current_line and line_px + space_px + word_px > max_px:
+            lines.append((current_line, line_px))
+            current_line, line_px = word, word_px
+        elif current_line:
+            current_line = f"{current_line} {word}"
+            line_px += space_px + word_px
         else:
-            current_line = test
+            current_line, line_px = word, word_px
     if current_line:
-        lines.append(current_line)
+        lines.append((current_line, line_px))
 
     # Draw each line centred vertically
     line_height = font.size if hasattr(font, "size") else 40
     total_text_height = line_height * len(lines)
     y_start = (thumb_h - total_text_height) // 2
 
-    for i, line in enumerate(lines):
-        bbox = draw.textbbox((0, 0), line, font=font)
-        text_w = bbox[2] - bbox[0]
-        x = (thumb_w - text_w) // 2
+    for i, (line, text_w) in enumerate(lines):
+        x = int(thumb_w - text_w) // 2
         y = y_start + i * line_height
 
         # Shadow
@@ -397,9 +549,10 @@ def generate_thumbnail(script: dict) -> str:
 def run(script: dict, visuals_map: dict, audio_path: str) -> dict:
     """Orchestrate the full video assembly pipeline.
 
-    1. Create a section clip for each entry in *visuals_map*.
-    2. Assemble the final video with intro, outro, and voiceover.
-    3. Generate a thumbnail.
+    1. Render the final video -- intro, a segment per entry in
+       *visuals_map*, outro and voiceover -- in one pass with
+       :func:`render_final`.
+    2. Generate a thumbnail.
 
     Parameters
     ----------
@@ -415,34 +568,10 @@ def run(script: dict, visuals_map: dict, audio_path: str) -> dict:
     dict
         ``{video_path: str, thumbnail_path: str}``.
     """
-    sections = script.get("sections", [])
-
-    # Estimate per-section duration from total audio
-    audio_dur = _probe_duration(audio_path)
-    num_sections = max(len(sections), 1)
-    # Reserve 7 seconds for intro (2s) + outro (5s)
-    content_dur = max(audio_dur - 7.0, num_sections * 5.0)
-    per_section = content_dur / num_sections
-
-    # Step 1 -- create section clips
-    section_clips: list[str] = []
-    for idx, section in enumerate(sections):
-        paths = visuals_map.get(str(idx), visuals_map.get(idx, []))
-        if not paths:
-            _log(f"Section {idx} has no footage, skipping clip creation")
-            continue
-
-        title = section.get("title", f"Section {idx + 1}")
-        clip_path = create_section_clip(paths, per_section, title, idx)
-        section_clips.append(clip_path)
-
-    if not section_clips:
-        raise RuntimeError("No section clips were created -- cannot assemble video.")
-
-    # Step 2 -- assemble final video
-    video_path = assemble_video(section_clips, audio_path, script)
+    # Step 1 -- render final video
+    video_path = render_final(script, visuals_map, audio_path)
 
-    # Step 3 -- thumbnail
+    # Step 2 -- thumbnail
     thumbnail_path = generate_thumbnail(script)
 
     return {"video_path": video_path, "thumbnail_path": thumbnail_path}
@@ -1,10 +1,36 @@
 """Notification module for sending Discord webhook alerts and logging to Supabase."""
 
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime, timezone
 
+import requests
 from discord_webhook import DiscordEmbed, DiscordWebhook
+from requests.adapters import HTTPAdapter
 
-from config.config import settings, supabase_client
+from config.config import get_supabase_client, settings
+
+# Shared keep-alive session for webhook posts, so repeated notifications
+# skip the TCP + TLS handshake.  DiscordWebhook.execute() always uses a
+# one-off ``requests.post``, so payloads are sent through this instead.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+DISCORD_TIMEOUT = 10
+DISCORD_MAX_RETRY_AFTER = 30  # longest rate-limit wait honoured, in seconds
+
+# Pipeline-run records are queued and bulk-inserted by a background thread
+# so logging never blocks the caller on a Supabase round-trip.
+LOG_BATCH_SIZE = 32
+LOG_FLUSH_INTERVAL = 1.0  # seconds to wait for a batch to fill
+LOG_SHUTDOWN_TIMEOUT = 10.0  # seconds allowed to drain the queue at exit
+
+_LOG_QUEUE: queue.Queue = queue.Queue()
+_LOG_STOP = object()
+_log_thread: threading.Thread | None = None
+_log_thread_lock = threading.Lock()
 
 
 def send_discord_notification(
@@ -38,7 +64,11 @@ def send_discord_notification(
         embed.set_url(url)
 
     webhook.add_embed(embed)
-    response = webhook.execute()
+    try:
+        response = _post_webhook(webhook_url, webhook.json)
+    except requests.RequestException as exc:
+        print(f"Failed to send Discord notification: {exc}")
+        return False
 
     if response and response.status_code in (200, 204):
         print(f"Discord notification sent: {title}")
@@ -48,6 +78,45 @@ def send_discord_notification(
     return False
 
 
+def _retry_after(response: requests.Response) -> float:
+    """Seconds Discord asked us to wait before retrying a 429 response."""
+    try:
+        delay = float(response.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        delay = float(response.headers.get("Retry-After") or 1)
+    return min(max(delay, 0.0), DISCORD_MAX_RETRY_AFTER)
+
+
+def _post_webhook(webhook_url: str, payload: dict) -> requests.Response:
+    """POST *payload* to *webhook_url*, retrying once if rate limited.
+
+    Args:
+        webhook_url: Discord webhook URL.
+        payload: Webhook JSON body.
+
+    Returns:
+        The final response.
+
+    Raises:
+        requests.RequestException: If the request fails.
+    """
+    def post() -> requests.Response:
+        return _SESSION.post(
+            webhook_url,
+            json=payload,
+            params={"wait": "true"},
+            timeout=DISCORD_TIMEOUT,
+        )
+
+    response = post()
+    if response.status_code == 429:
+        delay = _retry_after(response)
+        print(f"Discord rate limited, retrying in {delay:.1f}s")
+        time.sleep(delay)
+        response = post()
+    return response
+
+
 def log_pipeline_run(
     topic: str,
     status: str,
@@ -56,6 +125,9 @@ def log_pipeline_run(
 ) -> None:
     """Log a pipeline run to Supabase for tracking.
 
+    The record is queued and written by a background thread, so this
+    returns immediately; queued records are flushed at interpreter exit.
+
     Args:
         topic: The video topic that was processed.
         status: Status of the pipeline run (e.g. 'success', 'failed').
@@ -70,13 +142,73 @@ def log_pipeline_run(
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
+    _ensure_log_thread()
+    _LOG_QUEUE.put_nowait(record)
+
+
+def _insert_records(records: list) -> None:
+    """Bulk-insert *records* into the ``pipeline_runs`` table."""
     try:
-        supabase_client.table("pipeline_runs").insert(record).execute()
-        print(f"Pipeline run logged: {topic} - {status}")
+        get_supabase_client().table("pipeline_runs").insert(records).execute()
+        for record in records:
+            print(f"Pipeline run logged: {record['topic']} - {record['status']}")
     except Exception as e:
         print(f"Failed to log pipeline run to Supabase: {e}")
 
 
+def _log_worker() -> None:
+    """Drain the log queue in batches until the stop sentinel arrives."""
+    while True:
+        try:
+            item = _LOG_QUEUE.get(timeout=LOG_FLUSH_INTERVAL)
+        except queue.Empty:
+            continue
+
+        records, stop = [], item is _LOG_STOP
+        if not stop:
+            records.append(item)
+        while not stop and len(records) < LOG_BATCH_SIZE:
+            try:
+                item = _LOG_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+            if item is _LOG_STOP:
+                stop = True
+            else:
+                records.append(item)
+
+        if records:
+            _insert_records(records)
+        if stop:
+            return
+
+
+def _ensure_log_thread() -> None:
+    """Start the background log writer on first use."""
+    global _log_thread
+    with _log_thread_lock:
+        if _log_thread is None:
+            _log_thread = threading.Thread(
+                target=_log_worker, name="nexus-supabase-log", daemon=True
+            )
+            _log_thread.start()
+            atexit.register(flush_pipeline_logs)
+
+
+def flush_pipeline_logs() -> None:
+    """Write out any queued pipeline-run records and stop the writer thread.
+
+    Registered with :mod:`atexit`; safe to call more than once.
+    """
+    global _log_thread
+    with _log_thread_lock:
+        thread, _log_thread = _log_thread, None
+    if thread is None:
+        return
+    _LOG_QUEUE.put(_LOG_STOP)
+    thread.join(LOG_SHUTDOWN_TIMEOUT)
+
+
 if __name__ == "__main__":
     send_discord_notification(
         title="Test Notification",
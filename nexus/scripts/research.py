@@ -4,15 +4,46 @@ Finds trending video topics for a given niche using the YouTube Data API v3,
 then uses Claude 3.5 Sonnet (via AWS Bedrock) to pick the single best topic.
 """
 
+import heapq
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-from config.config import bedrock_client, settings, youtube_client
+import httplib2
+
+from config.config import YOUTUBE_HTTP_TIMEOUT, get_youtube_client
+from scripts import _json
+from scripts._bedrock import invoke_claude, strip_code_fences
+from scripts._paths import ASSETS_DIR, ensure_dir
 
 # Path to save research output
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 OUTPUT_PATH = os.path.join(ASSETS_DIR, "research_output.json")
+TOPICS_PATH = os.path.join(ASSETS_DIR, "research_topics.json")
+
+# Maximum concurrent niche searches in get_trending_topics_batch
+SEARCH_MAX_WORKERS = 8
+
+# Partial responses: request only the fields that are actually read
+SEARCH_FIELDS = "items(id/videoId)"
+VIDEO_FIELDS = (
+    "items(id,statistics(viewCount,likeCount,commentCount),"
+    "snippet(title,channelTitle,publishedAt))"
+)
+
+# httplib2 connections are not thread-safe, so each thread executes API
+# requests over its own keep-alive Http object (the API key travels in the
+# URL), reusing its connection for the search + videos round-trips.
+_thread_local = threading.local()
+
+
+def _thread_http() -> httplib2.Http:
+    """Return this thread's HTTP transport for YouTube API requests."""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = _thread_local.http = httplib2.Http(timeout=YOUTUBE_HTTP_TIMEOUT)
+    return http
 
 
 # ---------------------------------------------------------------------------
@@ -40,6 +71,7 @@ def get_trending_topics(niche: str, max_results: int = 20) -> list:
         ``channel``, ``published_at``.  The list is sorted by view count
         (descending).
     """
+    youtube_client = get_youtube_client()
     if youtube_client is None:
         raise RuntimeError(
             "YouTube client is not initialised. "
@@ -60,8 +92,9 @@ def get_trending_topics(niche: str, max_results: int = 20) -> list:
             order="viewCount",
             publishedAfter=published_after,
             maxResults=min(max_results, 50),
+            fields=SEARCH_FIELDS,
         )
-        .execute()
+        .execute(http=_thread_http())
     )
 
     video_ids = [
@@ -79,8 +112,9 @@ def get_trending_topics(niche: str, max_results: int = 20) -> list:
         .list(
             id=",".join(video_ids),
             part="snippet,statistics",
+            fields=VIDEO_FIELDS,
         )
-        .execute()
+        .execute(http=_thread_http())
     )
 
     topics: list[dict] = []
@@ -105,9 +139,24 @@ def get_trending_topics(niche: str, max_results: int = 20) -> list:
             }
         )
 
-    # Sort by views descending and cap at max_results
-    topics.sort(key=lambda t: t["views"], reverse=True)
-    return topics[:max_results]
+    # Top max_results by views, descending
+    return heapq.nlargest(max_results, topics, key=lambda t: t["views"])
+
+
+def get_trending_topics_batch(niches: list, max_results: int = 20) -> dict:
+    """Run :func:`get_trending_topics` for several *niches* concurrently.
+
+    Returns
+    -------
+    dict
+        Mapping of each niche to its topic list, in the order given.
+    """
+    if not niches:
+        return {}
+    workers = min(SEARCH_MAX_WORKERS, len(niches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda n: get_trending_topics(n, max_results), niches)
+        return dict(zip(niches, results))
 
 
 # ---------------------------------------------------------------------------
@@ -134,12 +183,6 @@ def analyze_topics(topics: list, niche: str) -> dict:
         Keys: ``selected_topic``, ``angle``, ``why``, ``target_audience``,
         ``key_points`` (list of strings).
     """
-    if bedrock_client is None:
-        raise RuntimeError(
-            "Bedrock client is not initialised. "
-            "Check your AWS credentials in the .env file."
-        )
-
     if not topics:
         raise ValueError("No topics provided for analysis.")
 
@@ -163,33 +206,9 @@ def analyze_topics(topics: list, niche: str) -> dict:
         f"Return ONLY valid JSON, no markdown fences or extra text."
     )
 
-    body = json.dumps(
-        {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 4096,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-    )
+    raw_text = invoke_claude(prompt, max_tokens=4096)
 
-    response = bedrock_client.invoke_model(
-        modelId=settings["BEDROCK_MODEL_ID"],
-        contentType="application/json",
-        accept="application/json",
-        body=body,
-    )
-
-    result = json.loads(response["body"].read())
-    raw_text: str = result["content"][0]["text"]
-
-    # Strip markdown code fences if present
-    cleaned = raw_text.strip()
-    if cleaned.startswith("```"):
-        # Remove opening fence (```json or ```)
-        cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-
-    parsed: dict = json.loads(cleaned.strip())
+    parsed: dict = _json.loads(strip_code_fences(raw_text))
 
     # Validate expected keys
     expected_keys = {"selected_topic", "angle", "why", "target_audience", "key_points"}
@@ -204,10 +223,11 @@ def analyze_topics(topics: list, niche: str) -> dict:
 # Pipeline entry point
 # ---------------------------------------------------------------------------
 
-def run(niche: str) -> dict:
+def run(niche: str, query: str | None = None) -> dict:
     """Run the full research step: discover trending topics then analyse them.
 
-    1. Calls :func:`get_trending_topics` for the given *niche*.
+    1. Calls :func:`get_trending_topics` for *query* (defaults to *niche*)
+       and saves the raw results to ``assets/research_topics.json``.
     2. Passes the results to :func:`analyze_topics`.
     3. Saves the output to ``assets/research_output.json``.
 
@@ -215,22 +235,30 @@ def run(niche: str) -> dict:
     ----------
     niche:
         The YouTube niche to research (e.g. "tech reviews").
+    query:
+        Optional, more specific YouTube search query within the niche.
 
     Returns
     -------
     dict
         The analysis dict produced by :func:`analyze_topics`.
     """
-    print(f"[research] Fetching trending topics for niche: {niche}")
-    topics = get_trending_topics(niche)
+    query = query or niche
+    print(f"[research] Fetching trending topics for: {query}")
+    topics = get_trending_topics(query)
     print(f"[research] Found {len(topics)} trending topics")
 
+    # Persist the raw topics now, before the slower Claude call
+    ensure_dir(os.path.dirname(TOPICS_PATH))
+    with open(TOPICS_PATH, "w") as f:
+        json.dump(topics, f, indent=2, default=str)
+
     print("[research] Analysing topics with Claude...")
     analysis = analyze_topics(topics, niche)
     print(f"[research] Selected topic: {analysis.get('selected_topic', 'N/A')}")
 
     # Persist to disk
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    ensure_dir(os.path.dirname(OUTPUT_PATH))
     with open(OUTPUT_PATH, "w") as f:
         json.dump(analysis, f, indent=2, default=str)
     print(f"[research] Saved output to {OUTPUT_PATH}")
@@ -7,42 +7,55 @@ downstream audio and video pipeline stages.
 
 import json
 import os
-
-from config.config import bedrock_client, settings
-
-PROMPT_PATH = os.path.join(os.path.dirname(__file__), "..", "prompts", "script_prompt.txt")
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
+from collections.abc import Iterator
+from functools import lru_cache
+
+from scripts import _json
+from scripts._bedrock import (
+    ResponseTruncated,
+    invoke_claude,
+    invoke_claude_stream,
+    strip_code_fences,
+)
+from scripts._paths import ASSETS_DIR, PROMPTS_DIR, ensure_dir
+
+PROMPT_PATH = os.path.join(PROMPTS_DIR, "script_prompt.txt")
 SCRIPT_OUTPUT_PATH = os.path.join(ASSETS_DIR, "script_output.json")
 
+# Per-topic context, sent after the static instructions in script_prompt.txt
+PROMPT_CONTEXT_TEMPLATE = (
+    "Topic: {topic}\n"
+    "Angle: {angle}\n"
+    "Target Audience: {target_audience}\n"
+    "Key Points to Cover:\n{key_points}"
+)
 
-def _load_prompt_template() -> str:
-    """Load the script prompt template from disk."""
-    with open(PROMPT_PATH, "r") as f:
-        return f.read()
+# Output token budget.  The prompt asks for 4-8 sections, so the first
+# attempt is sized from the key-point count and only a truncated reply is
+# retried with the full SCRIPT_MAX_TOKENS.
+SCRIPT_MAX_TOKENS = 8192
+SCRIPT_BASE_TOKENS = 1500
+SCRIPT_TOKENS_PER_SECTION = 600
+MIN_SECTIONS = 4
+MAX_SECTIONS = 8
 
+# The reply should be raw JSON; if the model fences it anyway, stop at the
+# closing fence instead of generating trailing commentary
+SCRIPT_STOP_SEQUENCES = ["\n```"]
 
-def generate_script(topic_dict: dict) -> dict:
-    """Generate a structured YouTube script from research output.
+# Top-level keys every generated script must have
+REQUIRED_SCRIPT_KEYS = frozenset({"title", "hook", "sections", "cta"})
 
-    Args:
-        topic_dict: Dictionary produced by research.py containing at minimum
-            ``topic``, ``angle``, ``target_audience``, and ``key_points``.
 
-    Returns:
-        A dict matching the structured JSON script schema (title, description,
-        tags, hook, sections, cta, total_duration_estimate).
+@lru_cache(maxsize=1)
+def _load_prompt_template() -> str:
+    """Load the static script-writing instructions from disk (read once)."""
+    with open(PROMPT_PATH, "r") as f:
+        return f.read()
 
-    Raises:
-        RuntimeError: If the Bedrock client is not initialised.
-        ValueError: If the model response cannot be parsed as valid JSON.
-        KeyError: If required keys are missing from *topic_dict*.
-    """
-    if bedrock_client is None:
-        raise RuntimeError(
-            "AWS Bedrock client is not initialised. "
-            "Check your AWS credentials and config."
-        )
 
+def _build_prompt_content(topic_dict: dict) -> list:
+    """Build the user message content blocks for *topic_dict*."""
     template = _load_prompt_template()
 
     # Format key_points as a readable string if it's a list
@@ -52,57 +65,138 @@ def generate_script(topic_dict: dict) -> dict:
     else:
         key_points_str = str(key_points)
 
-    prompt = template.format(
+    context = PROMPT_CONTEXT_TEMPLATE.format(
         topic=topic_dict["topic"],
         angle=topic_dict.get("angle", "general overview"),
         target_audience=topic_dict.get("target_audience", "general audience"),
         key_points=key_points_str,
     )
 
-    body = json.dumps(
-        {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 8192,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-    )
+    # Static instructions first, then the per-topic context.  No prompt-cache
+    # breakpoint: the instructions are below Bedrock's 1024-token minimum
+    # cacheable prefix, and one script per run never hits the 5-minute TTL.
+    return [
+        {"type": "text", "text": template},
+        {"type": "text", "text": context},
+    ]
 
-    response = bedrock_client.invoke_model(
-        modelId=settings["BEDROCK_MODEL_ID"],
-        contentType="application/json",
-        accept="application/json",
-        body=body,
-    )
 
-    result = json.loads(response["body"].read())
-    raw_text = result["content"][0]["text"]
+def _estimate_max_tokens(topic_dict: dict) -> int:
+    """Output token budget for a script about *topic_dict*."""
+    key_points = topic_dict.get("key_points", [])
+    count = len(key_points) if isinstance(key_points, list) else 0
+    sections = min(max(count, MIN_SECTIONS), MAX_SECTIONS)
+    return min(SCRIPT_MAX_TOKENS, SCRIPT_BASE_TOKENS + SCRIPT_TOKENS_PER_SECTION * sections)
+
+
+def _retry_budget(max_tokens: int) -> int:
+    """Return the budget to retry a reply truncated at *max_tokens*.
+
+    Raises:
+        ResponseTruncated: If *max_tokens* was already the full budget.
+    """
+    if max_tokens >= SCRIPT_MAX_TOKENS:
+        raise ResponseTruncated(f"Script exceeded max_tokens={SCRIPT_MAX_TOKENS}")
+    print(f"Script reply reached {max_tokens} tokens, retrying with {SCRIPT_MAX_TOKENS}")
+    return SCRIPT_MAX_TOKENS
+
+
+def generate_script(topic_dict: dict) -> dict:
+    """Generate a structured YouTube script from research output.
+
+    Args:
+        topic_dict: Dictionary produced by research.py containing at minimum
+            ``topic``, ``angle``, ``target_audience``, and ``key_points``.
+
+    Returns:
+        A dict matching the structured JSON script schema (title, description,
+        tags, hook, sections, cta, total_duration_estimate).
+
+    Raises:
+        RuntimeError: If the Bedrock client is not initialised, or the
+            script does not fit in ``SCRIPT_MAX_TOKENS``.
+        ValueError: If the model response cannot be parsed as valid JSON.
+        KeyError: If required keys are missing from *topic_dict*.
+    """
+    content = _build_prompt_content(topic_dict)
+    max_tokens = _estimate_max_tokens(topic_dict)
+    try:
+        raw_text = invoke_claude(content, max_tokens, SCRIPT_STOP_SEQUENCES)
+    except ResponseTruncated:
+        max_tokens = _retry_budget(max_tokens)
+        raw_text = invoke_claude(content, max_tokens, SCRIPT_STOP_SEQUENCES)
 
     # Strip markdown fences if the model wraps the JSON anyway
-    cleaned = raw_text.strip()
-    if cleaned.startswith("```"):
-        first_newline = cleaned.index("\n")
-        cleaned = cleaned[first_newline + 1 :]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[: -len("```")]
-    cleaned = cleaned.strip()
+    cleaned = strip_code_fences(raw_text)
 
     try:
-        script = json.loads(cleaned)
-    except json.JSONDecodeError as exc:
+        script = _json.loads(cleaned)
+    except _json.JSONDecodeError as exc:
         raise ValueError(
             f"Failed to parse model response as JSON: {exc}\n"
             f"Raw response (first 500 chars): {raw_text[:500]}"
         ) from exc
 
-    # Basic validation of expected top-level keys
-    required_keys = {"title", "hook", "sections", "cta"}
-    missing = required_keys - set(script.keys())
-    if missing:
+    _validate_script(script)
+    return script
+
+
+def generate_script_stream(topic_dict: dict) -> Iterator[tuple]:
+    """Generate a script, yielding its fields as the model writes them.
+
+    Streams the completion and parses it incrementally, yielding
+    ``(path, value)`` events (see :class:`scripts._json.StreamParser`) as
+    each value completes -- e.g. ``(("sections", 0, "visual_cue"), text)``
+    while later sections are still being generated.  The last event is
+    ``((), script)`` with the validated script dict.
+
+    If the reply is truncated it is regenerated with the full token
+    budget.  The retry is a fresh sample, so a ``(None, None)`` reset event
+    is yielded first: every event before it is stale and must be discarded.
+
+    Raises:
+        RuntimeError: If the Bedrock client is not initialised, or the
+            script does not fit in ``SCRIPT_MAX_TOKENS``.
+        ValueError: If the response is not a complete JSON object or is
+            missing required keys.
+        KeyError: If required keys are missing from *topic_dict*.
+    """
+    content = _build_prompt_content(topic_dict)
+    max_tokens = _estimate_max_tokens(topic_dict)
+    while True:
+        parser = _json.StreamParser()
+        received: list[str] = []
+        try:
+            for delta in invoke_claude_stream(content, max_tokens, SCRIPT_STOP_SEQUENCES):
+                received.append(delta)
+                for path, value in parser.feed(delta):
+                    if path:
+                        yield path, value
+            break
+        except ResponseTruncated:
+            max_tokens = _retry_budget(max_tokens)
+            yield None, None
+
+    script = parser.root
+    if not isinstance(script, dict):
+        raw_text = "".join(received)
         raise ValueError(
-            f"Model response is missing required keys: {missing}"
+            "Failed to parse model response as a JSON object\n"
+            f"Raw response (first 500 chars): {raw_text[:500]}"
         )
+    _validate_script(script)
+    yield (), script
 
-    return script
+
+def _validate_script(script: dict) -> None:
+    """Basic validation of expected top-level keys."""
+    # frozenset.difference() probes the dict directly, without building
+    # a set of its keys
+    missing = REQUIRED_SCRIPT_KEYS.difference(script)
+    if missing:
+        raise ValueError(
+            f"Model response is missing required keys: {sorted(missing)}"
+        )
 
 
 def save_script(script: dict) -> str:
@@ -114,10 +208,9 @@ def save_script(script: dict) -> str:
     Returns:
         The file path where the script was saved.
     """
-    os.makedirs(ASSETS_DIR, exist_ok=True)
+    ensure_dir(ASSETS_DIR)
 
-    with open(SCRIPT_OUTPUT_PATH, "w") as f:
-        json.dump(script, f, indent=2)
+    _json.write_atomic(SCRIPT_OUTPUT_PATH, script, indent=True)
 
     print(f"Script saved to {SCRIPT_OUTPUT_PATH}")
     return SCRIPT_OUTPUT_PATH
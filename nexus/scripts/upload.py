@@ -4,9 +4,12 @@ Handles OAuth2 authentication, resumable video upload, and thumbnail
 setting via the YouTube Data API v3.
 """
 
-import json
+import itertools
 import os
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -16,6 +19,8 @@ from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
 from config.config import settings
+from scripts import _json
+from scripts._paths import CONFIG_DIR, ensure_dir
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -25,22 +30,93 @@ SCOPES = [
     "https://www.googleapis.com/auth/youtube",
 ]
 
-CONFIG_DIR = os.path.join(os.path.dirname(__file__), "..", "config")
 CREDENTIALS_PATH = os.path.join(CONFIG_DIR, "youtube_credentials.json")
 
+# Resumable upload chunk size
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024  # 10 MB
+
 # Retry settings for resumable uploads
 MAX_RETRIES = 5
 RETRY_BACKOFF = 2  # seconds, doubled each attempt
+RETRY_BACKOFF_MAX = 60  # seconds, cap on a single wait
+
+# Authenticated (service, credentials) reused across authenticate_youtube()
+# calls in this process
+_service_cache: tuple | None = None
+_service_lock = threading.Lock()
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _retry_delay(retries: int) -> float:
+    """Seconds to wait before retry number *retries* (exponential, full jitter).
+
+    Randomising the whole wait spreads out retries from concurrent
+    pipeline runs hitting the same YouTube outage.
+    """
+    return random.uniform(0, min(RETRY_BACKOFF ** retries, RETRY_BACKOFF_MAX))
+
+
 def _log(msg: str) -> None:
     print(f"[upload] {msg}")
 
 
+def _pread_full(fd: int, length: int, offset: int) -> bytes:
+    """Read *length* bytes at *offset*, short only at end of file."""
+    parts = []
+    while length > 0:
+        data = os.pread(fd, length, offset)
+        if not data:
+            break
+        parts.append(data)
+        offset += len(data)
+        length -= len(data)
+    return b"".join(parts)
+
+
+class _ReadAheadFileUpload(MediaFileUpload):
+    """``MediaFileUpload`` that reads the next chunk while one is being sent.
+
+    Chunks are served through :meth:`getbytes` (rather than the stream
+    interface) so that, as soon as chunk *N* is handed to the HTTP layer,
+    chunk *N+1* is read from disk on a background thread and is ready by
+    the time the PUT for chunk *N* completes.  Reads use ``os.pread`` and
+    never move the shared file position.  Call :meth:`close` when done.
+    """
+
+    def __init__(self, filename: str, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-read")
+        self._prefetch: tuple[int, int, Future] | None = None
+
+    def has_stream(self) -> bool:
+        return False
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        fileno = self._fd.fileno()
+        if self._prefetch is not None and self._prefetch[:2] == (begin, length):
+            data = self._prefetch[2].result()
+        else:
+            # First chunk, or a retry resumed from a different offset
+            data = _pread_full(fileno, length, begin)
+
+        next_begin = begin + len(data)
+        if len(data) == length and next_begin < self._size:
+            future = self._reader.submit(_pread_full, fileno, length, next_begin)
+            self._prefetch = (next_begin, length, future)
+        else:
+            self._prefetch = None
+        return data
+
+    def close(self) -> None:
+        """Stop the read-ahead thread and close the file."""
+        self._reader.shutdown(wait=True)
+        self._prefetch = None
+        self._fd.close()
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -53,11 +129,17 @@ def authenticate_youtube():
     Subsequent runs reuse (and refresh) credentials stored at
     ``config/youtube_credentials.json``.
 
+    The service is built once per process from the discovery document
+    bundled with google-api-python-client and reused by later calls while
+    its credentials are still valid or refreshable.
+
     Returns
     -------
     googleapiclient.discovery.Resource
         An authenticated YouTube Data API v3 service object.
     """
+    global _service_cache
+
     client_secret_path = settings.get("YOUTUBE_CLIENT_SECRET_PATH", "client_secret.json")
     if not os.path.isfile(client_secret_path):
         raise FileNotFoundError(
@@ -65,6 +147,20 @@ def authenticate_youtube():
             "Set YOUTUBE_CLIENT_SECRET_PATH in your .env file."
         )
 
+    with _service_lock:
+        if _service_cache is not None:
+            service, cached_creds = _service_cache
+            # The service's authorised transport refreshes expired tokens
+            # itself, so only credentials it can't renew force a rebuild
+            if cached_creds.valid or cached_creds.refresh_token:
+                return service
+        service, creds = _build_service(client_secret_path)
+        _service_cache = (service, creds)
+        return service
+
+
+def _build_service(client_secret_path: str) -> tuple:
+    """Load or obtain OAuth2 credentials and build the YouTube service."""
     creds = None
 
     # Try loading existing credentials
@@ -93,14 +189,20 @@ def authenticate_youtube():
             creds = flow.run_local_server(port=0)
 
         # Persist credentials for next time
-        os.makedirs(CONFIG_DIR, exist_ok=True)
+        ensure_dir(CONFIG_DIR)
         with open(CREDENTIALS_PATH, "w") as f:
             f.write(creds.to_json())
         _log(f"Credentials saved to {CREDENTIALS_PATH}")
 
-    service = build("youtube", "v3", credentials=creds)
+    service = build(
+        "youtube",
+        "v3",
+        credentials=creds,
+        static_discovery=True,
+        cache_discovery=False,
+    )
     _log("YouTube service authenticated successfully")
-    return service
+    return service, creds
 
 
 def upload_video(
@@ -162,17 +264,20 @@ def upload_video(
     desc_parts.append("\n#Shorts #YouTube #AI")
     description = "\n".join(desc_parts)
 
-    # Tags -- pull from sections + niche hints
-    tags = []
-    for section in script.get("sections", []):
-        section_title = section.get("title", "")
-        if section_title:
-            tags.append(section_title)
-    target_audience = script.get("target_audience", "")
-    if target_audience:
-        tags.append(target_audience)
-    # Dedupe and cap at 30
-    tags = list(dict.fromkeys(tags))[:30]
+    # Tags -- pull from sections + niche hints.  YouTube compares tags
+    # case-insensitively, so dedupe on the casefolded text (keeping the
+    # first spelling) and stop once the cap of 30 is reached.
+    candidates = itertools.chain(
+        (section.get("title", "") for section in script.get("sections", [])),
+        (script.get("target_audience", ""),),
+    )
+    unique_tags: dict[str, str] = {}
+    for tag in candidates:
+        if tag:
+            unique_tags.setdefault(tag.casefold(), tag)
+            if len(unique_tags) == 30:
+                break
+    tags = list(unique_tags.values())
 
     body = {
         "snippet": {
@@ -187,11 +292,11 @@ def upload_video(
         },
     }
 
-    media = MediaFileUpload(
+    media = _ReadAheadFileUpload(
         video_path,
         mimetype="video/mp4",
         resumable=True,
-        chunksize=10 * 1024 * 1024,  # 10 MB chunks
+        chunksize=UPLOAD_CHUNK_SIZE,
     )
 
     request = youtube.videos().insert(
@@ -205,32 +310,35 @@ def upload_video(
     response = None
     retries = 0
 
-    while response is None:
-        try:
-            status, response = request.next_chunk()
-            if status:
-                pct = int(status.progress() * 100)
-                _log(f"Upload progress: {pct}%")
-        except HttpError as exc:
-            if exc.resp.status in (500, 502, 503, 504) and retries < MAX_RETRIES:
-                retries += 1
-                wait = RETRY_BACKOFF ** retries
-                _log(f"Server error {exc.resp.status}, retrying in {wait}s (attempt {retries}/{MAX_RETRIES})...")
-                time.sleep(wait)
-            else:
-                raise RuntimeError(
-                    f"YouTube upload failed after {retries} retries: {exc}"
-                ) from exc
-        except Exception as exc:
-            if retries < MAX_RETRIES:
-                retries += 1
-                wait = RETRY_BACKOFF ** retries
-                _log(f"Upload error: {exc}, retrying in {wait}s (attempt {retries}/{MAX_RETRIES})...")
-                time.sleep(wait)
-            else:
-                raise RuntimeError(
-                    f"YouTube upload failed after {retries} retries: {exc}"
-                ) from exc
+    try:
+        while response is None:
+            try:
+                status, response = request.next_chunk()
+                if status:
+                    pct = int(status.progress() * 100)
+                    _log(f"Upload progress: {pct}%")
+            except HttpError as exc:
+                if exc.resp.status in (500, 502, 503, 504) and retries < MAX_RETRIES:
+                    retries += 1
+                    wait = _retry_delay(retries)
+                    _log(f"Server error {exc.resp.status}, retrying in {wait:.1f}s (attempt {retries}/{MAX_RETRIES})...")
+                    time.sleep(wait)
+                else:
+                    raise RuntimeError(
+                        f"YouTube upload failed after {retries} retries: {exc}"
+                    ) from exc
+            except Exception as exc:
+                if retries < MAX_RETRIES:
+                    retries += 1
+                    wait = _retry_delay(retries)
+                    _log(f"Upload error: {exc}, retrying in {wait:.1f}s (attempt {retries}/{MAX_RETRIES})...")
+                    time.sleep(wait)
+                else:
+                    raise RuntimeError(
+                        f"YouTube upload failed after {retries} retries: {exc}"
+                    ) from exc
+    finally:
+        media.close()
 
     video_id = response["id"]
     _log(f"Video uploaded: https://www.youtube.com/watch?v={video_id}")
@@ -284,8 +392,8 @@ if __name__ == "__main__":
         print("Usage: python upload.py <script.json> <video_path> <thumbnail_path>")
         sys.exit(1)
 
-    with open(sys.argv[1], "r") as f:
-        script_data = json.load(f)
+    with open(sys.argv[1], "rb") as f:
+        script_data = _json.loads(f.read())
 
     url = run(script_data, sys.argv[2], sys.argv[3])
     print(f"Done: {url}")
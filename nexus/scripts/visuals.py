@@ -5,20 +5,30 @@ Pexels video search API, with fallback query simplification when no
 results are found.
 """
 
+import contextlib
+import hashlib
 import json
 import os
 import re
+import shutil
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 import requests
+import urllib3
 
-from config.config import settings
+from config.config import get_download_session, get_pexels_session, settings
+from scripts import _json
+from scripts._paths import ASSETS_DIR, ensure_dir
 
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 RAW_DIR = os.path.join(ASSETS_DIR, "raw")
 VISUALS_MAP_PATH = os.path.join(ASSETS_DIR, "visuals_map.json")
+SEARCH_CACHE_DIR = os.path.join(ASSETS_DIR, "pexels_cache")
 
 PEXELS_VIDEO_SEARCH_URL = "https://api.pexels.com/videos/search"
 
@@ -28,6 +38,46 @@ PREFERRED_HEIGHT = 1080
 MIN_DURATION = 5
 MAX_DURATION = 30
 
+# Sections searched and downloaded concurrently
+SECTION_MAX_WORKERS = 8
+
+# Pexels search results cached on disk, and for how long (seconds)
+SEARCH_CACHE_TTL = 24 * 60 * 60
+_search_cache: dict[tuple[str, int], Future] = {}
+_search_cache_lock = threading.Lock()
+
+# Clip downloads: worker threads per call, and the number of downloads
+# allowed in flight at once across all calls
+DOWNLOAD_MAX_WORKERS = 8
+DOWNLOAD_CONCURRENCY = 8
+_DOWNLOAD_SLOTS = threading.BoundedSemaphore(DOWNLOAD_CONCURRENCY)
+
+# Block size used when writing downloaded clips to disk
+COPY_BUFFER_SIZE = 1 << 20
+
+# Clips at least this large are fetched as RANGE_PARTS parallel byte-range
+# requests; each range resumes up to RANGE_RETRIES times if cut off
+RANGE_MIN_SIZE = 4 << 20
+RANGE_PARTS = 4
+RANGE_RETRIES = 2
+
+
+# Decorative words dropped by _simplify_query, matched case-insensitively
+# as whole whitespace-separated words (longest alternatives first)
+_FILLER = frozenset({
+    "stunning", "beautiful", "amazing", "incredible", "gorgeous",
+    "dramatic", "epic", "cinematic", "breathtaking", "vibrant",
+    "colorful", "dynamic", "powerful", "intense", "serene",
+    "majestic", "elegant", "subtle", "bold", "striking",
+    "very", "really", "extremely", "highly", "super",
+})
+_FILLER_RE = re.compile(
+    r"(?<!\S)(?:"
+    + "|".join(map(re.escape, sorted(_FILLER, key=len, reverse=True)))
+    + r")(?!\S)",
+    re.IGNORECASE,
+)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -40,16 +90,8 @@ def _simplify_query(query: str) -> str:
     (e.g. "stunning", "beautiful", "amazing") so Pexels has a better
     chance of returning results.
     """
-    filler = {
-        "stunning", "beautiful", "amazing", "incredible", "gorgeous",
-        "dramatic", "epic", "cinematic", "breathtaking", "vibrant",
-        "colorful", "dynamic", "powerful", "intense", "serene",
-        "majestic", "elegant", "subtle", "bold", "striking",
-        "very", "really", "extremely", "highly", "super",
-    }
-    words = query.split()
-    simplified = [w for w in words if w.lower() not in filler]
-    return " ".join(simplified) if simplified else query
+    simplified = " ".join(_FILLER_RE.sub("", query).split())
+    return simplified or query
 
 
 def _pick_best_file(video_files: list, duration: int | None) -> dict | None:
@@ -58,33 +100,48 @@ def _pick_best_file(video_files: list, duration: int | None) -> dict | None:
     Prefers HD (1920x1080) landscape files.  Falls back to the largest
     available file if no exact HD match exists.
     """
-    if not video_files:
-        return None
-
-    # Filter to landscape-ish files
-    landscape = [
-        f for f in video_files
-        if (f.get("width") or 0) >= (f.get("height") or 0)
-    ]
-    pool = landscape if landscape else video_files
-
-    # Prefer exact HD match
-    for f in pool:
-        if f.get("width") == PREFERRED_WIDTH and f.get("height") == PREFERRED_HEIGHT:
-            return f
+    def _rank(f: dict) -> tuple:
+        width = f.get("width") or 0
+        height = f.get("height") or 0
+        return (
+            width >= height,  # landscape-ish first
+            width == PREFERRED_WIDTH and height == PREFERRED_HEIGHT,  # then exact HD
+            width * height,  # then highest resolution
+        )
 
-    # Otherwise pick highest resolution
-    pool.sort(key=lambda f: (f.get("width") or 0) * (f.get("height") or 0), reverse=True)
-    return pool[0]
+    # Single pass; ties keep the first file, as before
+    return max(video_files, key=_rank, default=None)
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def _search_cache_path(visual_cue: str, count: int) -> str:
+    """On-disk cache file for one ``(visual_cue, count)`` search."""
+    digest = hashlib.sha1(f"{visual_cue}|{count}".encode("utf-8")).hexdigest()
+    return os.path.join(SEARCH_CACHE_DIR, f"{digest}.json")
+
+
+def _read_search_cache(path: str) -> list | None:
+    """Return cached results from *path*, or ``None`` if absent, stale or unreadable."""
+    try:
+        if os.path.getmtime(path) < time.time() - SEARCH_CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            return _json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
 def search_footage(visual_cue: str, count: int = 3) -> list:
     """Search Pexels for stock video clips matching *visual_cue*.
 
+    Results are cached in-process and under ``assets/pexels_cache/`` for
+    :data:`SEARCH_CACHE_TTL` seconds, so sections sharing a cue -- and
+    re-runs of the same script -- query Pexels only once.  Concurrent
+    callers asking for the same cue wait on a single request.
+
     Parameters
     ----------
     visual_cue:
@@ -97,21 +154,52 @@ def search_footage(visual_cue: str, count: int = 3) -> list:
     list[dict]
         Each dict: ``url``, ``width``, ``height``, ``duration``, ``thumbnail``.
     """
+    key = (visual_cue, count)
+    with _search_cache_lock:
+        pending = _search_cache.get(key)
+        owner = pending is None
+        if owner:
+            pending = _search_cache[key] = Future()
+    if not owner:
+        return list(pending.result())
+
+    try:
+        path = _search_cache_path(visual_cue, count)
+        results = _read_search_cache(path)
+        if results is None:
+            results = _search_pexels(visual_cue, count)
+            if results:
+                ensure_dir(SEARCH_CACHE_DIR)
+                _json.write_atomic(path, results)
+        else:
+            print(f"[visuals] Using cached search results for '{visual_cue}'")
+    except BaseException as exc:
+        # Let a later call retry instead of caching the failure
+        with _search_cache_lock:
+            del _search_cache[key]
+        pending.set_exception(exc)
+        raise
+
+    pending.set_result(results)
+    return list(results)
+
+
+def _search_pexels(visual_cue: str, count: int) -> list:
+    """Query the Pexels API for *visual_cue* (uncached; see :func:`search_footage`)."""
     api_key = settings.get("PEXELS_API_KEY", "")
     if not api_key:
         raise RuntimeError("PEXELS_API_KEY is not set in your .env file.")
 
-    headers = {"Authorization": api_key}
+    session = get_pexels_session()
 
     def _search(query: str) -> list:
-        resp = requests.get(
+        resp = session.get(
             PEXELS_VIDEO_SEARCH_URL,
-            headers=headers,
             params={"query": query, "per_page": count * 2, "orientation": "landscape"},
             timeout=15,
         )
         resp.raise_for_status()
-        return resp.json().get("videos", [])
+        return _json.loads(resp.content).get("videos", [])
 
     # First attempt with the original cue
     videos = _search(visual_cue)
@@ -153,9 +241,147 @@ def search_footage(visual_cue: str, count: int = 3) -> list:
     return results
 
 
+def _range_download_size(url: str) -> int | None:
+    """Return the size of *url* if it can be fetched in parallel byte ranges.
+
+    Returns ``None`` when the server does not advertise byte-range support,
+    the length is unknown, or the file is too small to be worth splitting.
+    A failed probe also returns ``None``: many CDNs reject HEAD (403/405)
+    while serving GET normally.
+    """
+    try:
+        resp = get_download_session().head(
+            url, allow_redirects=True, headers={"Accept-Encoding": "identity"}, timeout=15
+        )
+        resp.raise_for_status()
+        size = int(resp.headers.get("Content-Length") or 0)
+    except (requests.RequestException, ValueError):
+        return None
+    if resp.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None
+    if size < RANGE_MIN_SIZE:
+        return None
+    return size
+
+
+class _RangeNotSupported(Exception):
+    """The server answered a byte-range request with the whole file."""
+
+
+def _fetch_range(url: str, fd: int, start: int, end: int) -> None:
+    """Write bytes *start*..*end* (inclusive) of *url* at the same offsets in *fd*.
+
+    A dropped connection resumes from the last byte written, up to
+    :data:`RANGE_RETRIES` times.
+
+    Raises
+    ------
+    _RangeNotSupported
+        If the server ignores the ``Range`` header and replies ``200``.
+    """
+    session = get_download_session()
+    offset = start
+    for attempt in range(RANGE_RETRIES + 1):
+        try:
+            with session.get(
+                url,
+                headers={"Range": f"bytes={offset}-{end}", "Accept-Encoding": "identity"},
+                stream=True,
+                timeout=60,
+            ) as resp:
+                resp.raise_for_status()
+                if resp.status_code != 206:
+                    raise _RangeNotSupported(
+                        f"Range request returned HTTP {resp.status_code}"
+                    )
+                for chunk in resp.iter_content(COPY_BUFFER_SIZE):
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+            if offset > end:
+                return
+            raise requests.RequestException(
+                f"Range {start}-{end} ended early at byte {offset}"
+            )
+        except requests.RequestException:
+            if attempt == RANGE_RETRIES:
+                raise
+            print(f"[visuals] Resuming range {start}-{end} from byte {offset}")
+
+
+def _download_ranges(url: str, out_path: str, size: int) -> None:
+    """Download *url* to *out_path* as :data:`RANGE_PARTS` concurrent byte ranges."""
+    fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+
+        part_size = -(-size // RANGE_PARTS)
+        ranges = [
+            (start, min(start + part_size, size) - 1)
+            for start in range(0, size, part_size)
+        ]
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_fetch_range, url, fd, start, end)
+                for start, end in ranges
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        os.close(fd)
+
+
+def _download_stream(url: str, out_path: str) -> None:
+    """Download *url* to *out_path* over a single connection."""
+    with get_download_session().get(url, stream=True, timeout=60) as resp:
+        resp.raise_for_status()
+
+        # Let urllib3 undo any transfer encoding, then copy in C with
+        # large blocks rather than looping over small chunks in Python.  A
+        # buffered writer of the same size keeps one write() per block while
+        # still retrying short writes.
+        resp.raw.decode_content = True
+        with open(out_path, "wb", buffering=COPY_BUFFER_SIZE) as f:
+            shutil.copyfileobj(resp.raw, f, COPY_BUFFER_SIZE)
+
+
+def _download_clip(url: str, out_path: str) -> str | None:
+    """Download *url* to *out_path*; returns the path, or ``None`` on failure.
+
+    Large files served with ``Accept-Ranges: bytes`` are fetched as
+    parallel range requests written in place with :func:`os.pwrite`;
+    anything else, or a server that answers the ranges with the whole
+    file, falls back to a single streamed request.
+    """
+    filename = os.path.basename(out_path)
+    with _DOWNLOAD_SLOTS:
+        try:
+            print(f"[visuals] Downloading {filename}...")
+            size = _range_download_size(url) if hasattr(os, "pwrite") else None
+            if size is not None:
+                try:
+                    _download_ranges(url, out_path, size)
+                    return out_path
+                except _RangeNotSupported as exc:
+                    print(f"[visuals] {exc}; downloading {filename} in one stream")
+            _download_stream(url, out_path)
+            return out_path
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as exc:
+            # Reading resp.raw directly surfaces urllib3's own errors
+            print(f"[visuals] Failed to download {url}: {exc}")
+            with contextlib.suppress(OSError):
+                os.remove(out_path)
+            return None
+
+
 def download_footage(footage_list: list, section_index: int) -> list:
     """Download video clips to ``assets/raw/section_<index>_<n>.mp4``.
 
+    Clips are fetched concurrently; the returned paths keep the order of
+    *footage_list*, and clips that fail to download are left out.
+
     Parameters
     ----------
     footage_list:
@@ -168,39 +394,45 @@ def download_footage(footage_list: list, section_index: int) -> list:
     list[str]
         Local file paths of downloaded clips.
     """
-    os.makedirs(RAW_DIR, exist_ok=True)
-    paths: list[str] = []
+    ensure_dir(RAW_DIR)
 
-    for count, clip in enumerate(footage_list):
-        url = clip.get("url", "")
-        if not url:
-            continue
+    jobs = [
+        (clip["url"], os.path.join(RAW_DIR, f"section_{section_index}_{count}.mp4"))
+        for count, clip in enumerate(footage_list)
+        if clip.get("url")
+    ]
+    if not jobs:
+        return []
 
-        filename = f"section_{section_index}_{count}.mp4"
-        out_path = os.path.join(RAW_DIR, filename)
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_MAX_WORKERS, len(jobs))) as executor:
+        results = executor.map(lambda job: _download_clip(*job), jobs)
+        return [path for path in results if path is not None]
 
-        try:
-            print(f"[visuals] Downloading {filename}...")
-            resp = requests.get(url, stream=True, timeout=60)
-            resp.raise_for_status()
 
-            with open(out_path, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    f.write(chunk)
+def _process_section(index: int, section: dict) -> list:
+    """Search and download the footage for one script section."""
+    cue = section.get("visual_cue", "")
+    if not cue:
+        print(f"[visuals] Section {index} has no visual_cue, skipping")
+        return []
 
-            paths.append(out_path)
-        except requests.RequestException as exc:
-            print(f"[visuals] Failed to download {url}: {exc}")
-            continue
+    print(f"[visuals] Section {index}: searching for '{cue}'")
+    footage = search_footage(cue)
 
-    return paths
+    if not footage:
+        print(f"[visuals] No footage found for section {index}")
+        return []
+
+    downloaded = download_footage(footage, index)
+    print(f"[visuals] Section {index}: downloaded {len(downloaded)} clips")
+    return downloaded
 
 
 def get_visuals_for_script(script: dict) -> dict:
     """Fetch stock footage for every section in *script*.
 
-    Iterates through ``script["sections"]`` and uses each section's
-    ``visual_cue`` field to search and download clips.
+    Uses each section's ``visual_cue`` field to search and download clips,
+    processing the sections concurrently.
 
     Parameters
     ----------
@@ -217,28 +449,63 @@ def get_visuals_for_script(script: dict) -> dict:
     if not sections:
         raise ValueError("Script contains no sections.")
 
-    visuals_map: dict[str, list[str]] = {}
-
-    for index, section in enumerate(sections):
-        cue = section.get("visual_cue", "")
-        if not cue:
-            print(f"[visuals] Section {index} has no visual_cue, skipping")
-            visuals_map[str(index)] = []
-            continue
+    # Sections are independent, so search + download them side by side;
+    # _DOWNLOAD_SLOTS still caps the total number of clip downloads.
+    workers = min(SECTION_MAX_WORKERS, len(sections))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_process_section, range(len(sections)), sections)
+        return {str(index): paths for index, paths in enumerate(results)}
 
-        print(f"[visuals] Section {index}: searching for '{cue}'")
-        footage = search_footage(cue)
 
-        if not footage:
-            print(f"[visuals] No footage found for section {index}")
-            visuals_map[str(index)] = []
-            continue
+def get_visuals_for_script_stream(events: Iterable[tuple]) -> dict:
+    """Fetch stock footage while the script is still being generated.
 
-        downloaded = download_footage(footage, index)
-        visuals_map[str(index)] = downloaded
-        print(f"[visuals] Section {index}: downloaded {len(downloaded)} clips")
+    Consumes ``(path, value)`` events from
+    :func:`scripts.script.generate_script_stream` and starts the search +
+    download for section *i* as soon as its ``visual_cue`` is complete.
+    Sections without a cue are resolved once the final ``((), script)``
+    event arrives.  A ``(None, None)`` reset event (the script is being
+    regenerated) cancels the searches started so far; downloads already in
+    flight are waited for so they cannot overwrite the new clips.
 
-    return visuals_map
+    Returns
+    -------
+    dict
+        Mapping of section index (as string) to list of local video paths.
+    """
+    futures: dict = {}
+    script = None
+    with ThreadPoolExecutor(max_workers=SECTION_MAX_WORKERS) as executor:
+        for path, value in events:
+            if path is None:
+                for future in futures.values():
+                    future.cancel()
+                wait(futures.values())
+                futures.clear()
+            elif len(path) == 3 and path[0] == "sections" and path[2] == "visual_cue":
+                index = path[1]
+                futures[index] = executor.submit(_process_section, index, {"visual_cue": value})
+            elif path == ():
+                script = value
+
+        sections = (script or {}).get("sections", [])
+        if not sections:
+            raise ValueError("Script contains no sections.")
+
+        return {
+            str(index): (
+                futures[index].result() if index in futures
+                else _process_section(index, section)
+            )
+            for index, section in enumerate(sections)
+        }
+
+
+def _save_visuals_map(visuals_map: dict) -> None:
+    """Persist *visuals_map* to ``assets/visuals_map.json``."""
+    ensure_dir(os.path.dirname(VISUALS_MAP_PATH))
+    _json.write_atomic(VISUALS_MAP_PATH, visuals_map, indent=True)
+    print(f"[visuals] Saved visuals map to {VISUALS_MAP_PATH}")
 
 
 def run(script: dict) -> dict:
@@ -258,12 +525,17 @@ def run(script: dict) -> dict:
         Section-index-to-file-paths mapping.
     """
     visuals_map = get_visuals_for_script(script)
+    _save_visuals_map(visuals_map)
+    return visuals_map
 
-    os.makedirs(os.path.dirname(VISUALS_MAP_PATH), exist_ok=True)
-    with open(VISUALS_MAP_PATH, "w") as f:
-        json.dump(visuals_map, f, indent=2)
-    print(f"[visuals] Saved visuals map to {VISUALS_MAP_PATH}")
 
+def run_stream(events: Iterable[tuple]) -> dict:
+    """Like :func:`run`, but driven by script-generation events.
+
+    See :func:`get_visuals_for_script_stream`.
+    """
+    visuals_map = get_visuals_for_script_stream(events)
+    _save_visuals_map(visuals_map)
     return visuals_map
 
 
@@ -0,0 +1,113 @@
+"""Tests for the TTS cache handling in :mod:`scripts.audio`."""
+
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from scripts import audio
+
+CACHED_AUDIO = b"ID3 cached tts audio " * 64
+
+
+def _fake_client() -> SimpleNamespace:
+    """Stand-in ElevenLabs client that 'synthesises' fixed bytes."""
+    def convert(voice_id, text, model_id):
+        return iter([CACHED_AUDIO[:100], CACHED_AUDIO[100:]])
+
+    return SimpleNamespace(text_to_speech=SimpleNamespace(convert=convert))
+
+
+class IterReaderTest(unittest.TestCase):
+    def _read_all(self, chunks):
+        reader = audio._IterReader(chunks)
+        out = io.BytesIO()
+        shutil.copyfileobj(reader, out, 4)
+        return out.getvalue()
+
+    def test_empty_chunk_at_start(self):
+        self.assertEqual(self._read_all([b"", b"abc"]), b"abc")
+
+    def test_empty_chunks_in_middle(self):
+        self.assertEqual(self._read_all([b"abc", b"", b"", b"def"]), b"abcdef")
+
+
+class TTSCacheSurvivesOutputOverwriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        audio_dir = os.path.join(self.tmp, "audio")
+        cache_dir = os.path.join(audio_dir, "cache")
+        os.makedirs(cache_dir)
+        for name, value in {
+            "AUDIO_DIR": audio_dir,
+            "TTS_CACHE_DIR": cache_dir,
+            "FINAL_OUTPUT": os.path.join(audio_dir, "final_voiceover.mp3"),
+            "BG_MUSIC_PATH": os.path.join(self.tmp, "no_music.mp3"),
+        }.items():
+            patcher = mock.patch.object(audio, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            audio, "_tts_client_and_voice", return_value=(_fake_client(), "voice")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache_entry(self, text: str) -> str:
+        return audio._tts_cache_path("voice", text)
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_str_voiceover_is_not_linked_to_cache(self):
+        out_path = audio.generate_voiceover("Plain narration.")
+        cache_path = self._cache_entry("Plain narration.")
+
+        self.assertEqual(self._read(out_path), CACHED_AUDIO)
+        self.assertFalse(os.path.samefile(out_path, cache_path))
+
+        # Rewrite the output in place, as ffmpeg -y would
+        with open(out_path, "wb") as f:
+            f.write(b"overwritten")
+        self.assertEqual(self._read(cache_path), CACHED_AUDIO)
+
+    def test_segments_are_not_linked_to_cache(self):
+        script = {"hook": "Hook line.", "sections": [], "cta": "Hook line."}
+        paths = audio.generate_voiceover(script)
+        cache_path = self._cache_entry("Hook line.")
+
+        self.assertEqual(len(paths), 2)
+        for path in paths:
+            self.assertEqual(self._read(path), CACHED_AUDIO)
+            self.assertFalse(os.path.samefile(path, cache_path))
+            with open(path, "wb") as f:
+                f.write(b"overwritten")
+        self.assertEqual(self._read(cache_path), CACHED_AUDIO)
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg not installed")
+    def test_cache_survives_combine_audio_overwrite(self):
+        audio.generate_voiceover("Plain narration.")
+        cache_path = self._cache_entry("Plain narration.")
+
+        segment = os.path.join(self.tmp, "tone.mp3")
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "sine=d=1",
+             "-ar", "44100", "-ac", "2", "-acodec", "libmp3lame", segment],
+            check=True,
+        )
+        # ffprobe may be missing where ffmpeg is not; the format is known
+        with mock.patch.object(audio, "_probe_audio_format", return_value=(44100, 2)):
+            final_path = audio.combine_audio([segment, segment])
+
+        self.assertNotEqual(self._read(final_path), CACHED_AUDIO)
+        self.assertEqual(self._read(cache_path), CACHED_AUDIO)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for :mod:`scripts.visuals`."""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from scripts import visuals
+
+
+def _fake_process_section(index, section):
+    return [f"{index}:{section.get('visual_cue', '')}"]
+
+
+class ScriptStreamResetTest(unittest.TestCase):
+    def test_reset_discards_stale_cues(self):
+        script = {"sections": [{"visual_cue": "new city"}, {"visual_cue": "new sea"}]}
+        events = [
+            (("sections", 0, "visual_cue"), "old forest"),
+            (("sections", 1, "visual_cue"), "old desert"),
+            (None, None),
+            (("sections", 0, "visual_cue"), "new city"),
+            ((), script),
+        ]
+        with mock.patch.object(visuals, "_process_section", _fake_process_section):
+            visuals_map = visuals.get_visuals_for_script_stream(iter(events))
+
+        self.assertEqual(visuals_map, {"0": ["0:new city"], "1": ["1:new sea"]})
+
+
+CLIP_BYTES = os.urandom(64 * 1024)
+
+
+class _IgnoresRangeHandler(BaseHTTPRequestHandler):
+    """Advertises byte ranges but always answers with the whole file."""
+
+    range_requests = 0
+
+    def _send_headers(self):
+        self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(CLIP_BYTES)))
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._send_headers()
+
+    def do_GET(self):
+        if "Range" in self.headers:
+            type(self).range_requests += 1
+        self._send_headers()
+        self.wfile.write(CLIP_BYTES)
+
+    def log_message(self, *args):
+        pass
+
+
+class RangeIgnoredFallbackTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _IgnoresRangeHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_port}/clip.mp4"
+
+    @unittest.skipUnless(hasattr(os, "pwrite"), "range downloads need os.pwrite")
+    def test_falls_back_to_single_stream(self):
+        out_path = os.path.join(self.tmp, "clip.mp4")
+        with mock.patch.object(visuals, "RANGE_MIN_SIZE", 1024):
+            self.assertEqual(visuals._download_clip(self.url, out_path), out_path)
+
+        self.assertGreater(_IgnoresRangeHandler.range_requests, 0)
+        with open(out_path, "rb") as f:
+            self.assertEqual(f.read(), CLIP_BYTES)
+
+
+class _RejectsHeadHandler(BaseHTTPRequestHandler):
+    """Answers HEAD with 405 but serves GET normally."""
+
+    def do_HEAD(self):
+        self.send_response(405)
+        self.end_headers()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CLIP_BYTES)))
+        self.end_headers()
+        self.wfile.write(CLIP_BYTES)
+
+    def log_message(self, *args):
+        pass
+
+
+class HeadRejectedFallbackTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _RejectsHeadHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_port}/clip.mp4"
+
+    def test_head_405_falls_back_to_single_stream(self):
+        out_path = os.path.join(self.tmp, "clip.mp4")
+        self.assertEqual(visuals._download_clip(self.url, out_path), out_path)
+        with open(out_path, "rb") as f:
+            self.assertEqual(f.read(), CLIP_BYTES)
+
+
+if __name__ == "__main__":
+    unittest.main()